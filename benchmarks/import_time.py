@@ -0,0 +1,61 @@
+"""
+Import-time regression benchmark for `import psstdata`.
+
+Runs `import psstdata` in fresh interpreters, reports the median wall time, and fails if it exceeds a budget or if
+modules that should only load on demand (networking, NumPy, the JSON assets) were imported.
+
+    python -m benchmarks.import_time [--runs 20] [--budget-ms 75]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+DEFERRED_MODULES = ("requests", "urllib3", "numpy", "psstdata.loading", "psstdata.downloading", "psstdata.networking")
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import psstdata
+elapsed = time.perf_counter() - start
+loaded = [m for m in {DEFERRED_MODULES!r} if m in sys.modules]
+assets = [a for a in ("VOCAB_ARPABET", "ACCEPTED_PRONUNCIATIONS") if a in vars(sys.modules["psstdata.tasks"])]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded, "assets": assets}}))
+"""
+
+
+def measure(runs: int):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE], check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=75.0)
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    median_ms = 1000 * statistics.median(r["seconds"] for r in results)
+    loaded = sorted(set(m for r in results for m in r["loaded"]))
+    assets = sorted(set(a for r in results for a in r["assets"]))
+
+    print(f"import psstdata: median {median_ms:.1f}ms over {args.runs} runs (budget {args.budget_ms:.0f}ms)")
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f}ms exceeds budget {args.budget_ms:.0f}ms")
+    if loaded:
+        failures.append(f"imported eagerly: {', '.join(loaded)}")
+    if assets:
+        failures.append(f"assets loaded eagerly: {', '.join(assets)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
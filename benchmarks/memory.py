@@ -0,0 +1,71 @@
+"""
+Memory benchmark: `PSSTUtterance` vs `PSSTCompactUtterance`.
+
+Writes a synthetic `utterances.tsv` with N rows, loads it as a regular collection and as a compact one, and reports
+the bytes retained by each (measured with tracemalloc).
+
+    python -m benchmarks.memory [--utterances 100000]
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import tracemalloc
+
+from psstdata.datastructures import PSSTUtteranceCollection
+from psstdata.tasks import PROMPTS_BNT, PROMPTS_VNT
+
+COLUMNS = ("utterance_id", "session", "test", "prompt", "transcript", "correctness", "aq_index", "duration_frames",
+           "filename")
+
+
+def write_tsv(filename, n_utterances, seed=0):
+    rng = random.Random(seed)
+    with open(filename, "w") as f:
+        f.write("\t".join(COLUMNS) + "\n")
+        for i in range(n_utterances):
+            session = f"S{i // 37:05d}a"
+            test, prompts = ("BNT", PROMPTS_BNT) if i % 37 < 15 else ("VNT", PROMPTS_VNT)
+            item = i % 37 % 15 if test == "BNT" else i % 37 - 15
+            prompt = prompts[item]
+            utterance_id = f"{session}-{test}{item + 1:02d}-{prompt}"
+            transcript = rng.choice(("HH AW S", "K OW M", "B EH N CH", "<sil>", "K AH T"))
+            row = (utterance_id, session, test, prompt, transcript, "TRUE", f"{50 + i // 37 % 50}.5",
+                   str(rng.randint(8000, 80000)), f"audio/{test.lower()}/{session}/{utterance_id}.wav")
+            f.write("\t".join(row) + "\n")
+
+
+def retained_bytes(load):
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        tsv_file = os.path.join(root_dir, "utterances.tsv")
+        write_tsv(tsv_file, args.utterances)
+
+        regular, regular_bytes = retained_bytes(lambda: PSSTUtteranceCollection.from_tsv(tsv_file).utterances)
+        del regular
+        compact, compact_bytes = retained_bytes(
+            lambda: PSSTUtteranceCollection.from_tsv(tsv_file).compact().utterances
+        )
+        del compact
+
+    for name, size in (("PSSTUtterance", regular_bytes), ("PSSTCompactUtterance", compact_bytes)):
+        print(f"{name:22s} {size / 1024**2:8.1f}MB  {size / args.utterances:6.0f} bytes/utterance")
+    print(f"{'saved':22s} {100 * (1 - compact_bytes / regular_bytes):7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+End-to-end benchmark suite on synthetic data packs served by a local TalkBank stand-in.
+
+For each data size, generates a pack, publishes it through `PSSTStandInServer`, and times: the first `download`, an
+incremental upgrade to a version with 5% of its audio changed, cold/snapshot/memoized `load`, hashed lookups and
+`where` queries, audio reads (WAV and packed) and one epoch of batching. Settings and data live in a temporary
+directory, so your own `~/.config/psstdata` is never touched.
+
+    python -m benchmarks.suite [--sizes 500 5000] [--reads 1000]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def timed(results, name, n=None):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    results.append((name, elapsed, n))
+
+
+def run(n_utterances: int, n_reads: int, workdir: str):
+    import psstdata
+    import psstdata.loading
+    import psstdata.packing
+    import psstdata.snapshots
+    from psstdata.downloading import download
+    from psstdata.synthetic import generate_pack, build_server_dir, derive_version, PSSTStandInServer
+
+    source_dir = os.path.join(workdir, f"source-{n_utterances}")
+    server_dir = os.path.join(workdir, f"server-{n_utterances}")
+    local_dir = os.path.join(workdir, f"local-{n_utterances}")
+    version = generate_pack(source_dir, n_utterances, version_id=f"SYNTHETIC{n_utterances}", max_seconds=2.0)
+    build_server_dir(version, server_dir)
+
+    results = []
+    with PSSTStandInServer(server_dir) as server:
+        _write_settings(server)
+        with timed(results, "download"):
+            download(local_dir, version_id=version.version_id)
+        upgrade = derive_version(version, f"{version.version_id}-UPGRADE")
+        build_server_dir(upgrade, server_dir)
+        with timed(results, "download (upgrade)"):
+            download(local_dir, version_id=upgrade.version_id)
+
+    load = lambda **kwargs: psstdata.load(version.version_id, local_dir=local_dir, log_level=logging.WARNING,
+                                          offline=True, **kwargs)
+    with timed(results, "load (parse TSVs)"):
+        load(cache=False)
+    with timed(results, "load (write snapshot)"):
+        load()
+    psstdata.snapshots.clear_memo()
+    psstdata.loading._loaded.clear()
+    with timed(results, "load (read snapshot)"):
+        load()
+    with timed(results, "load (memoized)"):
+        data = load()
+
+    train = data.train
+    ids = list(train.utterance_ids())
+    with timed(results, "lookup by utterance_id", len(ids)):
+        for utterance_id in ids:
+            train[utterance_id]
+    with timed(results, "where(test, prompt)", 100):
+        for _ in range(100):
+            train.where(test="VNT", prompt="bark")
+
+    rng = random.Random(0)
+    sample = [rng.choice(ids) for _ in range(n_reads)]
+    with timed(results, "audio read (WAV)", n_reads):
+        for utterance_id in sample:
+            train[utterance_id].audio().sum()
+    with timed(results, "pack"):
+        psstdata.packing.pack(data.version)
+    with timed(results, "audio read (packed)", n_reads):
+        for utterance_id in sample:
+            train.audio(utterance_id).sum()
+    with timed(results, "batching (one epoch)", len(train)):
+        for _ in train.batches(16000 * 60):
+            pass
+
+    return results
+
+
+def _write_settings(server):
+    from psstdata.config import CONFIG_FILE_SETTINGS, PSSTSettings
+    os.makedirs(os.path.dirname(CONFIG_FILE_SETTINGS), exist_ok=True)
+    with open(CONFIG_FILE_SETTINGS, "w") as f:
+        json.dump({
+            "base_url": server.url,
+            "download_username": server.username,
+            "download_password": server.password,
+            "parallel_n_jobs": 3,
+            "versions_ttl_seconds": 0,
+        }, f)
+    PSSTSettings.load.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000])
+    parser.add_argument("--reads", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Settings paths are resolved from $HOME when psstdata.config is imported, so set it first.
+        os.environ["HOME"] = workdir
+        for n_utterances in args.sizes:
+            print(f"\n{n_utterances} utterances")
+            for name, seconds, n in run(n_utterances, args.reads, workdir):
+                per_item = f"{1e6 * seconds / n:10.1f}us each" if n else ""
+                print(f"  {name:26s} {1000 * seconds:10.1f}ms {per_item}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,34 @@
+import importlib
+
 from psstdata.consts import *
-from psstdata.tasks import PAD, UNK, SIL, SPN, VOCAB_ARPABET_JSON, VOCAB_ARPABET, ACCEPTED_PRONUNCIATIONS, \
-    PROMPTS_BNT, PROMPTS_VNT
-from psstdata.datastructures import PSSTUtterance, PSSTData, PSSTUtteranceCollection
+from psstdata.tasks import PAD, UNK, SIL, SPN, VOCAB_ARPABET_JSON, PROMPTS_BNT, PROMPTS_VNT
+from psstdata.datastructures import PSSTUtterance, PSSTData, PSSTUtteranceCollection, AQSeverity
 
-from psstdata.loading import load
 from psstdata.logs import logger
 
+# Imported on first access, to keep `import psstdata` fast for code that only needs the data structures.
+_LAZY_ATTRIBUTES = {
+    "VOCAB_ARPABET": "psstdata.tasks",
+    "ACCEPTED_PRONUNCIATIONS": "psstdata.tasks",
+    "load": "psstdata.loading",
+}
+
+
+__all__ = [
+    "WAV_FRAME_RATE",
+    "PAD", "UNK", "SIL", "SPN", "VOCAB_ARPABET_JSON", "PROMPTS_BNT", "PROMPTS_VNT",
+    "PSSTUtterance", "PSSTData", "PSSTUtteranceCollection", "AQSeverity",
+    "logger",
+    *_LAZY_ATTRIBUTES,
+]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_LAZY_ATTRIBUTES))
@@ -1,3 +1,32 @@
+import argparse
+import sys
+
 import psstdata
 
-psstdata.load()
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m psstdata", description="Download (by default) or verify PSST data.")
+    commands = parser.add_subparsers(dest="command")
+    verify_parser = commands.add_parser("verify", help="check every utterance's audio in a downloaded data version")
+    verify_parser.add_argument("--version", dest="version_id", default=None, help="default: the latest local version")
+    verify_parser.add_argument("--local-dir", default=None, help="default: `local_dir` in settings.json")
+    verify_parser.add_argument("--no-hashes", dest="hashes", action="store_false",
+                               help="skip comparing file contents to each split's manifest.json")
+    verify_parser.add_argument("--jobs", dest="n_jobs", type=int, default=None, help="default: one per CPU")
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        from psstdata.verification import verify
+        try:
+            report = verify(args.version_id, local_dir=args.local_dir, hashes=args.hashes, n_jobs=args.n_jobs)
+        except KeyError:
+            version = f"data version {args.version_id}" if args.version_id else "data version"
+            verify_parser.error(f"no {version} downloaded in {args.local_dir or 'the local directory'}")
+        print(report)
+        sys.exit(0 if report.ok else 1)
+    else:
+        psstdata.load()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ import dataclasses
 import inspect
 import json
 from functools import lru_cache
-from typing import Type, TypeVar, Callable, Iterable, Dict
+from typing import Type, TypeVar, Callable, Iterable, Iterator, Dict, List, Sequence, Tuple
 
 T = TypeVar("T")
 
@@ -38,34 +38,79 @@ def read_json(json_file: str, t: Type[T]) -> T:
         return cast_dict(obj, t)
 
 
-def read_tsv(tsv_file: str, t: Type[T]) -> Iterable[T]:
-    items = []
-    row_factory = read_tsv_row_factory(t)
+def read_tsv(tsv_file: str, t: Type[T], **constants) -> List[T]:
+    return list(iter_tsv(tsv_file, t, **constants))
+
+
+def iter_tsv(tsv_file: str, t: Type[T], **constants) -> Iterator[T]:
+    """
+    Stream records from a TSV file, one at a time. The row decoder is compiled once for the file's header, and
+    `constants` (e.g. `root_dir`) are passed to every record's constructor.
+    """
     with open(tsv_file) as f:
         reader = csv.reader(f, dialect=csv.excel_tab)
-        columns = next(reader)
+        columns = tuple(next(reader))
+        decode = compile_row_decoder(t, columns, tuple(constants.items()))
+        n_columns = len(columns)
         for row in reader:
-            item = row_factory(columns, row)
-            items.append(item)
-    return items
+            if len(row) != n_columns:
+                # Ragged row: fall back to zip() semantics, which ignore missing/extra cells
+                yield t(**_row_dict(t, columns, row), **constants)
+                continue
+            yield decode(row)
+
+
+@lru_cache()
+def compile_row_decoder(
+        t: Type[T],
+        columns: Tuple[str, ...],
+        constants: Tuple[Tuple[str, any], ...] = ()
+) -> Callable[[Sequence[str]], T]:
+    """
+    Compile a function that turns a row (in `columns` order) into a `t`, with each cell's cast resolved ahead of
+    time and `constants` injected as keyword arguments.
+    """
+    casts = _field_casts(t)
+    namespace = {"t": t}
+    arguments = []
+    for i, column in enumerate(columns):
+        cast = casts[column]
+        if cast is str:
+            arguments.append(f"{column}=row[{i}]")
+        else:
+            namespace[f"cast_{i}"] = cast
+            arguments.append(f"{column}=cast_{i}(row[{i}])")
+    for name, value in constants:
+        namespace[f"constant_{name}"] = value
+        arguments.append(f"{name}=constant_{name}")
+    source = f"def decode(row):\n    return t({', '.join(arguments)})\n"
+    exec(source, namespace)
+    return namespace["decode"]
 
 
 @lru_cache()
 def read_tsv_row_factory(t: Type[T]) -> Callable[[Iterable[str], Iterable[any]], T]:
+    def cast(columns, row):
+        return t(**_row_dict(t, columns, row))
+
+    return cast
+
+
+def _row_dict(t: Type[T], columns: Iterable[str], row: Iterable[any]) -> Dict[str, any]:
+    casts = _field_casts(t)
+    return {
+        column: casts[column](value)
+        for column, value in zip(columns, row)
+    }
+
+
+@lru_cache()
+def _field_casts(t: Type[T]) -> Dict[str, Callable[[str], any]]:
     casts_special = {
         bool: lambda s: bool(json.loads(s.lower()))
     }
 
-    fields = {
+    return {
         field.name: casts_special.get(field.type, field.type)
         for field in dataclasses.fields(t)
     }
-
-    def cast(columns, row):
-        return t(**{
-            column: fields[column](value)
-            for column, value in zip(columns, row)
-        })
-
-
-    return cast
\ No newline at end of file
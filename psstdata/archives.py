@@ -0,0 +1,72 @@
+import dataclasses
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+import psstdata
+from psstdata.audio import WavInfo, map_wav, parse_wav_info
+
+ARCHIVE_FILENAME = "audio.tar"
+ARCHIVE_INDEX_FILENAME = "audio.tar.index.npz"
+ARCHIVE_FORMAT = 1
+METADATA_FILENAMES = ("utterances.tsv",)  # Extracted beside the archive, so the split loads as usual
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTAudioArchive:
+    """
+    A split's files kept in one uncompressed tar instead of being extracted, with an index of member `filename`
+    (relative to the split directory) -> (byte offset, size). Audio is memory-mapped straight out of the tar.
+    """
+    root_dir: str
+    index: Dict[str, Tuple[int, int]] = dataclasses.field(repr=False)
+    _headers: Dict[str, WavInfo] = dataclasses.field(default_factory=dict, repr=False)
+    _lock: threading.Lock = dataclasses.field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def open(cls, root_dir: str) -> Optional["PSSTAudioArchive"]:
+        """Open the archive in a split directory, or return None if the split was extracted instead."""
+        index_file = os.path.join(root_dir, ARCHIVE_INDEX_FILENAME)
+        if not os.path.exists(index_file):
+            return None
+        with np.load(index_file) as index:
+            if int(index["format"]) != ARCHIVE_FORMAT:
+                psstdata.logger.warning(f"Ignoring audio archive in {root_dir} with an unknown format.")
+                return None
+            entries = dict(zip(index["filenames"].tolist(), zip(index["offsets"].tolist(), index["sizes"].tolist())))
+        return cls(root_dir, entries)
+
+    def __reduce__(self):
+        # The header cache and its lock stay with this process
+        return PSSTAudioArchive, (self.root_dir, self.index)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.root_dir, ARCHIVE_FILENAME)
+
+    def __contains__(self, filename):
+        return filename in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def wav_info(self, filename: str) -> WavInfo:
+        with self._lock:
+            if filename not in self._headers:
+                offset, size = self.index[filename]
+                with open(self.path, "rb") as f:
+                    self._headers[filename] = parse_wav_info(f, self._name(filename), offset, size)
+            return self._headers[filename]
+
+    def read(self, filename: str, start: int = 0, stop: int = None, *, dtype="int16",
+             expected_frames: int = None) -> np.ndarray:
+        """Frames `[start, stop)` of the WAV member `filename`. See `psstdata.audio.read_audio`."""
+        return map_wav(self.path, self.wav_info(filename), start, stop, dtype=dtype,
+                       expected_frames=expected_frames, filename=self._name(filename))
+
+    def _name(self, filename):
+        return f"{self.path}:{filename}"
+
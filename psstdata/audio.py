@@ -0,0 +1,120 @@
+import os
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from psstdata import WAV_FRAME_RATE
+
+PCM_FORMAT = 1
+PCM_DTYPE = np.dtype("<i2")
+WAV_INFO_CACHE_SIZE = 65536  # Parsed headers kept in memory, more than the utterances in every split together
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    """
+    The parts of a RIFF/WAVE header needed to map the PCM samples directly.
+
+    data_offset (int):  byte offset of the first sample in the `data` chunk
+    n_frames (int):     the number of frames in the `data` chunk
+    """
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    data_offset: int
+    n_frames: int
+
+
+class PSSTAudioError(ValueError):
+    def __init__(self, filename, message):
+        self.filename = filename
+        self.message = message
+
+    def __str__(self):
+        return f"{self.message} ({self.filename})"
+
+
+def read_wav_info(filename: str) -> WavInfo:
+    """
+    Parse the header of a 16-bit PCM WAV file, skipping over any non-audio chunks (`bext`, `junk`, ...). Headers
+    are cached by path, size and mtime, so a file rewritten in place is parsed again.
+    """
+    stat = os.stat(filename)
+    return _read_wav_info(filename, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=WAV_INFO_CACHE_SIZE)
+def _read_wav_info(filename: str, mtime_ns: int, size: int) -> WavInfo:
+    with open(filename, "rb") as f:
+        return parse_wav_info(f, filename, 0, size)
+
+
+def parse_wav_info(f, filename: str, start: int, size: int) -> WavInfo:
+    """
+    Parse the header of a WAV file stored at bytes `[start, start + size)` of the open file `f`, e.g. a member of an
+    uncompressed tar. `data_offset` is relative to the start of `f`, and `filename` is only used in errors.
+    """
+    fmt = None
+    f.seek(start)
+    riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+    if riff != b"RIFF" or wave != b"WAVE":
+        raise PSSTAudioError(filename, "Not a RIFF/WAVE file")
+    while True:
+        header = f.read(8)
+        if len(header) < 8 or f.tell() > start + size:
+            raise PSSTAudioError(filename, "No `data` chunk found")
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise PSSTAudioError(filename, "`data` chunk precedes `fmt ` chunk")
+            audio_format, channels, sample_rate, _, block_align, bits_per_sample = fmt
+            if audio_format != PCM_FORMAT or bits_per_sample != 16:
+                raise PSSTAudioError(filename, f"Expected 16-bit PCM, found format {audio_format} "
+                                               f"with {bits_per_sample} bits per sample")
+            data_size = min(chunk_size, start + size - f.tell())
+            return WavInfo(sample_rate, channels, bits_per_sample, f.tell(), data_size // block_align)
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def read_audio(filename: str, start: int = 0, stop: int = None, *, dtype=np.int16, expected_frames: int = None):
+    """
+    Read frames `[start, stop)` of a WAV file.
+
+    With `dtype=np.int16` this is a read-only view over a memory-mapped file, so nothing outside the requested
+    range is read from disk. With `dtype=np.float32` the range is converted and scaled to [-1.0, 1.0).
+    Multichannel audio is returned with shape (frames, channels).
+    """
+    return map_wav(filename, read_wav_info(filename), start, stop, dtype=dtype, expected_frames=expected_frames)
+
+
+def map_wav(path: str, info: WavInfo, start: int = 0, stop: int = None, *, dtype=np.int16,
+            expected_frames: int = None, filename: str = None):
+    """Read frames `[start, stop)` of the PCM described by `info`, memory-mapped from `path`. See `read_audio`."""
+    filename = filename or path
+    if info.sample_rate != WAV_FRAME_RATE:
+        raise PSSTAudioError(filename, f"Expected {WAV_FRAME_RATE}Hz audio, found {info.sample_rate}Hz")
+    if expected_frames is not None and info.n_frames != expected_frames:
+        raise PSSTAudioError(filename, f"Expected {expected_frames} frames, found {info.n_frames}")
+    if info.n_frames == 0:
+        samples = np.zeros((0, info.channels), dtype=PCM_DTYPE)
+    else:
+        shape = (info.n_frames, info.channels)
+        samples = np.memmap(path, dtype=PCM_DTYPE, mode="r", offset=info.data_offset, shape=shape)
+    if info.channels == 1:
+        samples = samples[:, 0]
+    return _convert(samples[start:stop], dtype)
+
+
+def _convert(samples: np.ndarray, dtype) -> np.ndarray:
+    dtype = np.dtype(dtype)
+    if dtype == np.int16:
+        return samples
+    if dtype == np.float32:
+        return samples.astype(np.float32) / np.float32(32768)
+    raise TypeError(f"Unsupported audio dtype {dtype}; use int16 or float32")
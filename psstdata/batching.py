@@ -0,0 +1,107 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTBatch:
+    """
+    A batch of utterances with their audio padded into one array.
+
+    utterances (PSSTUtteranceCollection):   the utterances in this batch, in the same order as the rows of `audio`
+    audio (np.ndarray):                     shape (batch size, longest length), zero-padded
+    lengths (np.ndarray):                   the unpadded number of frames in each row of `audio`
+    """
+    utterances: "PSSTUtteranceCollection"
+    audio: np.ndarray
+    lengths: np.ndarray
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+def plan_batches(
+        collection: "PSSTUtteranceCollection",
+        max_frames: int,
+        *,
+        n_buckets: int = 10,
+        seed: int = 0,
+        epoch: int = 0,
+        shuffle: bool = True,
+) -> List[np.ndarray]:
+    """
+    Group utterance positions into batches whose padded size (batch size times the longest `duration_frames`) is
+    at most `max_frames`. Utterances are first split into `n_buckets` buckets of similar duration to keep padding
+    low. With `shuffle`, the order within buckets and of the batches is shuffled, deterministically per
+    `seed` and `epoch`. An utterance longer than `max_frames` gets a batch of its own.
+    """
+    durations = collection.columns().duration_frames
+    rng = np.random.default_rng((seed, epoch))
+
+    by_duration = np.argsort(durations, kind="stable")
+    batches = []
+    for bucket in np.array_split(by_duration, min(n_buckets, len(by_duration)) or 1):
+        if shuffle:
+            bucket = rng.permutation(bucket)
+        batch, longest = [], 0
+        for position in bucket.tolist():
+            longest_with = max(longest, int(durations[position]))
+            if batch and longest_with * (len(batch) + 1) > max_frames:
+                batches.append(np.array(batch))
+                batch, longest_with = [], int(durations[position])
+            batch.append(position)
+            longest = longest_with
+        if batch:
+            batches.append(np.array(batch))
+
+    if shuffle:
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+    return batches
+
+
+def iter_batches(
+        collection: "PSSTUtteranceCollection",
+        max_frames: int,
+        *,
+        n_buckets: int = 10,
+        seed: int = 0,
+        epoch: int = 0,
+        shuffle: bool = True,
+        prefetch: int = 2,
+        n_workers: int = 4,
+        dtype="int16",
+) -> Iterator[PSSTBatch]:
+    """
+    Yield `PSSTBatch`es as planned by `plan_batches`. Audio is read and padded on a pool of `n_workers` threads,
+    up to `prefetch` batches ahead of the consumer.
+    """
+    batches = plan_batches(collection, max_frames, n_buckets=n_buckets, seed=seed, epoch=epoch, shuffle=shuffle)
+
+    def load(positions: np.ndarray) -> PSSTBatch:
+        from psstdata.datastructures import PSSTUtteranceCollection
+        audio = [collection.audio(int(p), dtype=dtype) for p in positions]
+        lengths = np.array([len(a) for a in audio], dtype=np.int64)
+        padded = np.zeros((len(audio), lengths.max(initial=0)), dtype=dtype)
+        for row, a in zip(padded, audio):
+            row[:len(a)] = a
+        utterances = PSSTUtteranceCollection(tuple(collection.utterances[p] for p in positions))
+        return PSSTBatch(utterances, padded, lengths)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        pending = deque()
+        try:
+            for positions in batches:
+                pending.append(executor.submit(load, positions))
+                if len(pending) > prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
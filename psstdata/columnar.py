@@ -0,0 +1,160 @@
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, Tuple, Sequence, Union, TYPE_CHECKING
+
+import numpy as np
+
+from psstdata import WAV_FRAME_RATE
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+# How string columns are stored outside of Python objects (exports, shared memory): as codes into categories where
+# values repeat, and as variable-length strings where they don't. `root_dir` is made categorical on the way out.
+CATEGORICAL_COLUMNS = ("session", "test", "prompt", "root_dir")
+STRING_COLUMNS = ("utterance_id", "transcript", "filename")
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTCategorical:
+    """
+    A string column stored as integer codes into a tuple of distinct categories (in order of first appearance).
+    """
+    codes: np.ndarray
+    categories: Tuple[str, ...]
+
+    @classmethod
+    def from_values(cls, values: Sequence[str]) -> "PSSTCategorical":
+        lookup = {}
+        codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=len(values))
+        return cls(codes, tuple(lookup))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __eq__(self, other):
+        """Vectorized comparison against a single category, returning a boolean mask."""
+        if isinstance(other, PSSTCategorical):
+            return self.categories == other.categories and np.array_equal(self.codes, other.codes)
+        return self.codes == self.code(other)
+
+    def isin(self, values) -> np.ndarray:
+        codes = [self.code(v) for v in values]
+        return np.isin(self.codes, codes)
+
+    def code(self, value: str) -> int:
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+    def values(self) -> np.ndarray:
+        return np.asarray(self.categories, dtype=object)[self.codes]
+
+    def take(self, positions: np.ndarray) -> "PSSTCategorical":
+        return PSSTCategorical(self.codes[positions], self.categories)
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTColumns:
+    """
+    A columnar (struct-of-arrays) view of a `PSSTUtteranceCollection`.
+
+    Numeric and boolean fields are NumPy arrays, `session`/`test`/`prompt` are `PSSTCategorical` codes, and the
+    remaining string fields are object arrays. Selection takes a boolean mask or an integer index array.
+    """
+    utterance_id: np.ndarray
+    session: PSSTCategorical
+    test: PSSTCategorical
+    prompt: PSSTCategorical
+    transcript: np.ndarray
+    correctness: np.ndarray
+    aq_index: np.ndarray
+    duration_frames: np.ndarray
+    filename: np.ndarray
+    root_dir: np.ndarray
+
+    @classmethod
+    def from_collection(cls, collection: "PSSTUtteranceCollection") -> "PSSTColumns":
+        utterances = collection.utterances
+        n = len(utterances)
+
+        def objects(field):
+            array = np.empty(n, dtype=object)
+            array[:] = [getattr(u, field) for u in utterances]
+            return array
+
+        return cls(
+            utterance_id=objects("utterance_id"),
+            session=PSSTCategorical.from_values([u.session for u in utterances]),
+            test=PSSTCategorical.from_values([u.test for u in utterances]),
+            prompt=PSSTCategorical.from_values([u.prompt for u in utterances]),
+            transcript=objects("transcript"),
+            correctness=np.fromiter((u.correctness for u in utterances), dtype=bool, count=n),
+            aq_index=np.fromiter((np.nan if u.aq_index is None else u.aq_index for u in utterances), dtype=np.float64, count=n),
+            duration_frames=np.fromiter((u.duration_frames for u in utterances), dtype=np.int64, count=n),
+            filename=objects("filename"),
+            root_dir=objects("root_dir"),
+        )
+
+    def __len__(self):
+        return len(self.utterance_id)
+
+    def __getitem__(self, item: Union[np.ndarray, slice]) -> "PSSTColumns":
+        positions = np.arange(len(self))[item]
+        return self.take(positions)
+
+    def take(self, positions: np.ndarray) -> "PSSTColumns":
+        return PSSTColumns(**{
+            field.name: getattr(self, field.name)[positions]
+            if not isinstance(getattr(self, field.name), PSSTCategorical)
+            else getattr(self, field.name).take(positions)
+            for field in dataclasses.fields(self)
+        })
+
+    @property
+    def duration_seconds(self) -> np.ndarray:
+        return self.duration_frames / WAV_FRAME_RATE
+
+    @property
+    def severity(self) -> np.ndarray:
+        """The `AQSeverity` values of each row, as an integer array (see `AQSeverity.from_scores`)."""
+        from psstdata.datastructures import AQSeverity
+        return AQSeverity.from_scores(self.aq_index)
+
+    def sort(self, by: str, descending: bool = False) -> "PSSTColumns":
+        column = getattr(self, by)
+        if isinstance(column, PSSTCategorical):
+            column = column.values()
+        order = np.argsort(column, kind="stable")
+        if descending:
+            order = order[::-1]
+        return self.take(order)
+
+    def groupby(self, by: str) -> Dict[object, "PSSTColumns"]:
+        """Split into one `PSSTColumns` per distinct value of `by`, keeping row order within each group."""
+        column = getattr(self, by) if by != "severity" else self.severity
+        if isinstance(column, PSSTCategorical):
+            keys, codes = column.categories, column.codes
+        else:
+            keys, codes = np.unique(column, return_inverse=True)
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.searchsorted(codes[order], np.arange(1, len(keys)))
+        return {
+            _scalar(key): self.take(positions)
+            for key, positions in zip(keys, np.split(order, boundaries))
+            if len(positions)
+        }
+
+    def to_collection(self) -> "PSSTUtteranceCollection":
+        from psstdata.datastructures import PSSTUtterance, PSSTUtteranceCollection
+        rows = zip(
+            self.utterance_id.tolist(), self.session.values(), self.test.values(), self.prompt.values(),
+            self.transcript.tolist(), self.correctness.tolist(), [None if a != a else a for a in self.aq_index.tolist()],
+            self.duration_frames.tolist(), self.filename.tolist(), self.root_dir.tolist(),
+        )
+        return PSSTUtteranceCollection(tuple(PSSTUtterance(*row) for row in rows))
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
@@ -20,6 +20,11 @@ class PSSTSettings:
     base_url: str = "https://media.talkbank.org/aphasia/RaPID"
 
     parallel_n_jobs: int = 1
+    offline: bool = False
+    versions_ttl_seconds: float = 3600
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    extract_audio: bool = True
     auth_server: str = "https://sla2.talkbank.org:1515"
     download_username: str = ""
     download_password: str = ""
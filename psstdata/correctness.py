@@ -0,0 +1,148 @@
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+Pronunciation = Tuple[str, ...]
+
+
+class BKTree:
+    """
+    A Burkhard-Keller tree over phoneme sequences, for finding the pronunciations within a given edit distance of a
+    query without comparing against every one.
+    """
+
+    def __init__(self, items: Sequence[Pronunciation]):
+        self.root = None
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Pronunciation):
+        if self.root is None:
+            self.root = (item, {})
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(item, node[0])
+            if distance == 0:
+                return
+            if distance not in node[1]:
+                node[1][distance] = (item, {})
+                return
+            node = node[1][distance]
+
+    def search(self, query: Pronunciation, max_distance: int) -> List[Tuple[int, Pronunciation]]:
+        """All items within `max_distance` of `query`, as (distance, item), nearest first."""
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            item, children = stack.pop()
+            distance = levenshtein(query, item)
+            if distance <= max_distance:
+                results.append((distance, item))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return sorted(results)
+
+    def nearest(self, query: Pronunciation) -> Optional[Tuple[int, Pronunciation]]:
+        best = None
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            item, children = stack.pop()
+            distance = levenshtein(query, item)
+            if best is None or (distance, item) < best:
+                best = (distance, item)
+            for child_distance, child in children.items():
+                if distance - best[0] <= child_distance <= distance + best[0]:
+                    stack.append(child)
+        return best
+
+
+class PSSTCorrectnessClassifier:
+    """
+    Scores BNT/VNT responses as correct when their transcript is one of the accepted pronunciations of the prompt.
+
+    Accepted pronunciations are precompiled into a hash set of phoneme tuples per prompt, for exact matching, and a
+    `BKTree` per prompt, for tolerance-based matching and nearest-pronunciation lookups.
+    """
+
+    def __init__(self, accepted: Mapping[str, Sequence[str]]):
+        self.accepted: Dict[str, FrozenSet[Pronunciation]] = {
+            prompt: frozenset(_phonemes(p) for p in pronunciations)
+            for prompt, pronunciations in accepted.items()
+        }
+        self.trees: Dict[str, BKTree] = {
+            prompt: BKTree(sorted(pronunciations))
+            for prompt, pronunciations in self.accepted.items()
+        }
+
+    @classmethod
+    @lru_cache()
+    def default(cls) -> "PSSTCorrectnessClassifier":
+        """The classifier for `psstdata.ACCEPTED_PRONUNCIATIONS`."""
+        from psstdata.tasks import ACCEPTED_PRONUNCIATIONS
+        return cls(ACCEPTED_PRONUNCIATIONS)
+
+    def is_correct(self, prompt: str, transcript: str, tolerance: int = 0) -> bool:
+        """Whether `transcript` is within `tolerance` phoneme edits of an accepted pronunciation of `prompt`."""
+        phonemes = _phonemes(transcript)
+        if phonemes in self.accepted.get(prompt, ()):
+            return True
+        if tolerance <= 0 or prompt not in self.trees:
+            return False
+        return bool(self.trees[prompt].search(phonemes, tolerance))
+
+    def nearest(self, prompt: str, transcript: str) -> Optional[Tuple[str, int]]:
+        """The accepted pronunciation of `prompt` nearest to `transcript`, and its phoneme edit distance."""
+        phonemes = _phonemes(transcript)
+        if phonemes in self.accepted.get(prompt, ()):
+            return " ".join(phonemes), 0
+        if prompt not in self.trees:
+            return None
+        distance, pronunciation = self.trees[prompt].nearest(phonemes)
+        return " ".join(pronunciation), distance
+
+    def classify(
+            self,
+            collection: "PSSTUtteranceCollection",
+            hypotheses: Mapping[str, str] = None,
+            tolerance: int = 0,
+    ) -> np.ndarray:
+        """
+        Classify every utterance in `collection` against its `prompt`, returning a boolean array. Uses the
+        `hypotheses` (by `utterance_id`) when given, and otherwise each utterance's own `transcript`.
+        """
+        if hypotheses is None:
+            transcripts = (u.transcript for u in collection)
+        else:
+            transcripts = (hypotheses[u.utterance_id] for u in collection)
+        if tolerance <= 0:
+            empty = frozenset()
+            return np.fromiter(
+                (_phonemes(t) in self.accepted.get(u.prompt, empty) for u, t in zip(collection, transcripts)),
+                dtype=bool, count=len(collection),
+            )
+        return np.fromiter(
+            (self.is_correct(u.prompt, t, tolerance) for u, t in zip(collection, transcripts)),
+            dtype=bool, count=len(collection),
+        )
+
+
+def levenshtein(a: Sequence[str], b: Sequence[str]) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def _phonemes(transcript: str) -> Pronunciation:
+    return tuple(transcript.split())
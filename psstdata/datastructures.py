@@ -1,15 +1,14 @@
 import dataclasses
 import datetime
-import itertools
 import numbers
 import os
+import sys
 from dataclasses import dataclass
 from enum import Enum
-from functools import lru_cache
-from typing import Iterable, Iterator, Union, Tuple
+from typing import Iterable, Iterator, Union, Tuple, Dict, Any, Optional
 
 from psstdata import WAV_FRAME_RATE
-from psstdata._system import read_tsv
+from psstdata._system import iter_tsv
 from psstdata.versioning import PSSTVersion
 
 
@@ -69,13 +68,165 @@ class PSSTUtterance:
     def session_metadata(self) -> "PSSTSessionMetadata":
         return PSSTSessionMetadata(self.session, self.aq_index)
 
+    def audio(self, start: int = 0, stop: int = None, *, dtype="int16"):
+        """
+        The recording's samples in frames `[start, stop)`, as a read-only NumPy view over the memory-mapped WAV
+        (or a float32 copy with `dtype="float32"`). Raises `PSSTAudioError` if the file's frame count or rate
+        doesn't match `duration_frames` and `WAV_FRAME_RATE`.
+        """
+        from psstdata.audio import read_audio
+        return read_audio(self.filename_absolute, start, stop, dtype=dtype, expected_frames=self.duration_frames)
+
+
+class PSSTSplitContext:
+    """State shared by every `PSSTCompactUtterance` of one split."""
+    __slots__ = ("root_dir",)
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+
+class PSSTCompactUtterance:
+    """
+    A memory-lean, immutable stand-in for `PSSTUtterance`, with the same fields and properties.
+
+    Uses `__slots__` instead of a `__dict__`, interns the strings that repeat across utterances, shares `root_dir`
+    through a `PSSTSplitContext`, and stores `filename` only when it differs from the standard
+    `audio/{test}/{session}/{utterance_id}.wav` layout.
+    """
+    __slots__ = ("utterance_id", "session", "test", "prompt", "transcript", "correctness", "aq_index",
+                 "duration_frames", "_filename", "_split")
+
+    def __init__(self, utterance_id: str, session: str, test: str, prompt: str, transcript: str, correctness: bool,
+                 aq_index: float, duration_frames: int, filename: str, split: PSSTSplitContext):
+        setattr_ = object.__setattr__
+        session, test = sys.intern(session), sys.intern(test)
+        setattr_(self, "utterance_id", utterance_id)
+        setattr_(self, "session", session)
+        setattr_(self, "test", test)
+        setattr_(self, "prompt", sys.intern(prompt))
+        setattr_(self, "transcript", sys.intern(transcript))
+        setattr_(self, "correctness", correctness)
+        setattr_(self, "aq_index", aq_index)
+        setattr_(self, "duration_frames", duration_frames)
+        standard = f"audio/{test.lower()}/{session}/{utterance_id}.wav"
+        setattr_(self, "_filename", None if filename == standard else filename)
+        setattr_(self, "_split", split)
+
+    @classmethod
+    def from_utterance(cls, utterance: PSSTUtterance, split: PSSTSplitContext = None) -> "PSSTCompactUtterance":
+        split = split or PSSTSplitContext(utterance.root_dir)
+        return cls(utterance.utterance_id, utterance.session, utterance.test, utterance.prompt, utterance.transcript,
+                   utterance.correctness, utterance.aq_index, utterance.duration_frames, utterance.filename, split)
+
+    def to_utterance(self) -> PSSTUtterance:
+        return PSSTUtterance(self.utterance_id, self.session, self.test, self.prompt, self.transcript,
+                             self.correctness, self.aq_index, self.duration_frames, self.filename, self.root_dir)
+
+    def __setattr__(self, name, value):
+        raise dataclasses.FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise dataclasses.FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __reduce__(self):
+        return PSSTCompactUtterance, (self.utterance_id, self.session, self.test, self.prompt, self.transcript,
+                                      self.correctness, self.aq_index, self.duration_frames, self.filename,
+                                      self._split)
+
+    def _key(self):
+        return (self.utterance_id, self.session, self.test, self.prompt, self.transcript, self.correctness,
+                self.aq_index, self.duration_frames, self.filename, self.root_dir)
+
+    def __eq__(self, other):
+        if isinstance(other, PSSTCompactUtterance):
+            return self._key() == other._key()
+        if isinstance(other, PSSTUtterance):
+            return self._key() == dataclasses.astuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return repr(self.to_utterance()).replace("PSSTUtterance(", "PSSTCompactUtterance(", 1)
+
+    @property
+    def filename(self) -> str:
+        if self._filename is not None:
+            return self._filename
+        return f"audio/{self.test.lower()}/{self.session}/{self.utterance_id}.wav"
+
+    @property
+    def root_dir(self) -> str:
+        return self._split.root_dir
+
+    filename_absolute = PSSTUtterance.filename_absolute
+    duration = PSSTUtterance.duration
+    duration_seconds = PSSTUtterance.duration_seconds
+    session_metadata = PSSTUtterance.session_metadata
+    audio = PSSTUtterance.audio
+
+
+INDEXED_FIELDS = ("session", "test", "prompt", "severity")
+_UNPICKLED_CACHES = ("_columns", "_packs", "_archives", "_encoded")
+
 
 @dataclass(frozen=True)
 class PSSTUtteranceCollection(Iterable[PSSTUtterance]):
     utterances: Tuple[PSSTUtterance, ...]
 
+    _ids: Dict[str, int] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _indexes: Dict[str, Dict[Any, Tuple[int, ...]]] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _columns: "PSSTColumns" = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _packs: Dict[str, Tuple[Optional[int], "PSSTAudioPack"]] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _archives: Dict[str, "PSSTAudioArchive"] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _encoded: "PSSTEncodedTranscripts" = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _session_groups: Dict["PSSTSessionMetadata", Tuple[int, ...]] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _session_stats: Dict["PSSTSessionMetadata", "PSSTSessionStats"] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+    _sessions: Dict["PSSTSessionMetadata", "PSSTUtteranceCollection"] = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         assert isinstance(self.utterances, tuple), "Utterances must be a tuple."
+        ids = {}
+        indexes = {field: {} for field in INDEXED_FIELDS}
+        by_session = {}
+        for i, u in enumerate(self.utterances):
+            ids[u.utterance_id] = i
+            indexes["session"].setdefault(u.session, []).append(i)
+            indexes["test"].setdefault(u.test, []).append(i)
+            indexes["prompt"].setdefault(u.prompt, []).append(i)
+            by_session.setdefault((u.session, u.aq_index), []).append(i)
+
+        # Severity only depends on the session's AQ, so it's computed once per session rather than per utterance.
+        # An AQ that can't be classified is indexed as UNKNOWN, so building a collection never fails on severity.
+        session_groups, session_stats = {}, {}
+        for (session, aq_index), positions in by_session.items():
+            metadata = PSSTSessionMetadata(session, aq_index)
+            try:
+                severity = metadata.severity
+            except ValueError:
+                severity = AQSeverity.UNKNOWN
+            session_stats[metadata] = PSSTSessionStats(
+                n_utterances=len(positions),
+                total_frames=sum(self.utterances[p].duration_frames for p in positions),
+                severity=severity,
+            )
+            session_groups[metadata] = tuple(positions)
+            indexes["severity"].setdefault(severity, []).extend(positions)
+        if len(session_groups) > 1:
+            indexes["severity"] = {key: sorted(positions) for key, positions in indexes["severity"].items()}
+        session_groups = dict(sorted(session_groups.items(), key=lambda item: item[0].session))
+        session_stats = {metadata: session_stats[metadata] for metadata in session_groups}
+
+        indexes = {
+            field: {key: tuple(positions) for key, positions in index.items()}
+            for field, index in indexes.items()
+        }
+        object.__setattr__(self, "_ids", ids)
+        object.__setattr__(self, "_indexes", indexes)
+        object.__setattr__(self, "_session_groups", session_groups)
+        object.__setattr__(self, "_session_stats", session_stats)
 
     def __iter__(self) -> Iterator[PSSTUtterance]:
         yield from self.utterances
@@ -87,26 +238,172 @@ class PSSTUtteranceCollection(Iterable[PSSTUtterance]):
         if isinstance(item, (int, slice)):
             return self.utterances[item]
         if isinstance(item, str):
-            return next(u for u in self.utterances if u.utterance_id == item)
+            return self.utterances[self._ids[item]]
         raise NotImplementedError()
 
-    @lru_cache()
-    def sessions(self):
-        by_session = itertools.groupby(sorted(self.utterances, key=lambda s: s.session), key=lambda s: s.session_metadata)
-        return {
-            session: PSSTUtteranceCollection(tuple(session_utterances))
-            for session, session_utterances in by_session
-        }
+    def __contains__(self, item):
+        if isinstance(item, (PSSTUtterance, PSSTCompactUtterance)):
+            return self.get(item.utterance_id) == item
+        return item in self._ids
+
+    def get(self, utterance_id: str, default=None):
+        i = self._ids.get(utterance_id)
+        return default if i is None else self.utterances[i]
+
+    def keys(self, field: str):
+        """The distinct values of an indexed field (one of `INDEXED_FIELDS`), in order of first appearance."""
+        return tuple(self._indexes[field])
+
+    def where(self, **criteria) -> "PSSTUtteranceCollection":
+        """
+        Select utterances matching every criterion, using the collection's hash indexes.
+
+        Criteria are keyword arguments over `INDEXED_FIELDS` (e.g. `where(test="VNT", prompt="bark")`). A value can
+        also be a set/list/tuple of accepted values. `severity` accepts `AQSeverity` members. The result keeps the
+        original order of utterances.
+        """
+        unknown = set(criteria).difference(INDEXED_FIELDS)
+        if unknown:
+            raise KeyError(f"Not an indexed field: {', '.join(sorted(unknown))}")
+        if not criteria:
+            return self
+
+        candidates = []
+        for field, accepted in criteria.items():
+            if not isinstance(accepted, (set, frozenset, list, tuple)):
+                accepted = (accepted,)
+            index = self._indexes[field]
+            accepted = frozenset(accepted)
+            positions = [p for value in accepted for p in index.get(value, ())]
+            candidates.append((len(positions), field, accepted, positions))
+
+        # Only the smallest candidate list is walked; each of its utterances is checked against the other criteria
+        # directly, so the cost follows the smallest match rather than the largest.
+        candidates.sort(key=lambda candidate: candidate[0])
+        _, _, _, smallest = candidates[0]
+        others = [(field, accepted) for _, field, accepted, _ in candidates[1:]]
+        positions = sorted(
+            p for p in smallest
+            if all(self._indexed_value(field, p) in accepted for field, accepted in others)
+        )
+        return PSSTUtteranceCollection(tuple(self.utterances[p] for p in positions))
+
+    def _indexed_value(self, field: str, position: int):
+        utterance = self.utterances[position]
+        if field == "severity":
+            metadata = PSSTSessionMetadata(utterance.session, utterance.aq_index)
+            return self._session_stats[metadata].severity
+        return getattr(utterance, field)
+
+    def sessions(self) -> Dict["PSSTSessionMetadata", "PSSTUtteranceCollection"]:
+        """The utterances of each session, ordered by session name. Built on first use from the grouping."""
+        if self._sessions is None:
+            sessions = {
+                metadata: PSSTUtteranceCollection(tuple(self.utterances[p] for p in positions))
+                for metadata, positions in self._session_groups.items()
+            }
+            object.__setattr__(self, "_sessions", sessions)
+        return self._sessions
+
+    def session_keys(self) -> Tuple["PSSTSessionMetadata", ...]:
+        """The metadata of each session in this collection, without building per-session collections."""
+        return tuple(self._session_groups)
+
+    def session_stats(self) -> Dict["PSSTSessionMetadata", "PSSTSessionStats"]:
+        """Utterance count, total frames and severity for each session, precomputed at construction."""
+        return self._session_stats
+
+    def audio(self, item: Union[int, str], start: int = 0, stop: int = None, *, dtype="int16"):
+        """
+        The audio for the utterance at `item` (an index or `utterance_id`). Reads from the split's audio pack when
+        one has been built (see `psstdata.packing`), then from the split's tar when it was downloaded with
+        `extract_audio=False` (see `psstdata.archives`), and otherwise from the WAV file. See `PSSTUtterance.audio`.
+        """
+        utterance = self[item]
+        pack = self._pack(utterance.root_dir)
+        if pack is not None and utterance.utterance_id in pack:
+            return pack.read(utterance.utterance_id, start, stop, dtype=dtype)
+        archive = self._archive(utterance.root_dir)
+        if archive is not None and utterance.filename in archive:
+            return archive.read(utterance.filename, start, stop, dtype=dtype, expected_frames=utterance.duration_frames)
+        return utterance.audio(start, stop, dtype=dtype)
+
+    def batches(self, max_frames: int, **kwargs) -> Iterator["PSSTBatch"]:
+        """
+        Iterate over duration-bucketed batches of padded audio, capped at `max_frames` padded frames per batch.
+        See `psstdata.batching.iter_batches` for the options (`seed`, `epoch`, `prefetch`, ...).
+        """
+        from psstdata.batching import iter_batches
+        return iter_batches(self, max_frames, **kwargs)
+
+    def shard(self, rank: int, world_size: int, **kwargs) -> "PSSTUtteranceCollection":
+        """
+        The utterances for `rank` of `world_size` data-parallel ranks, balanced by `duration_frames`. See
+        `psstdata.sharding.plan_shards` for the options (`balance`, `seed`, `epoch`, `keep_sessions`), and for the
+        plan's `imbalance`.
+        """
+        from psstdata.sharding import plan_shards
+        if not 0 <= rank < world_size:
+            raise ValueError(f"rank must be in [0, {world_size}), not {rank}")
+        positions = plan_shards(self, world_size, **kwargs).shards[rank]
+        return PSSTUtteranceCollection(tuple(self.utterances[p] for p in positions.tolist()))
+
+    def _pack(self, root_dir: str) -> "PSSTAudioPack":
+        # Cached by the pack index's mtime, so a pack built (or rebuilt) after the first read is picked up
+        if not root_dir:
+            return None
+        from psstdata.packing import PSSTAudioPack, pack_version
+        if self._packs is None:
+            object.__setattr__(self, "_packs", {})
+        version = pack_version(root_dir)
+        cached = self._packs.get(root_dir)
+        if cached is None or cached[0] != version:
+            cached = self._packs[root_dir] = (version, PSSTAudioPack.open(root_dir) if version is not None else None)
+        return cached[1]
+
+    def _archive(self, root_dir: str) -> "PSSTAudioArchive":
+        if self._archives is None:
+            object.__setattr__(self, "_archives", {})
+        if root_dir not in self._archives:
+            from psstdata.archives import PSSTAudioArchive
+            self._archives[root_dir] = PSSTAudioArchive.open(root_dir) if root_dir else None
+        return self._archives[root_dir]
+
+    def __getstate__(self):
+        # Open packs and archives (memory maps, locks) and derived arrays are rebuilt on demand after unpickling
+        state = dict(self.__dict__)
+        for cache in _UNPICKLED_CACHES:
+            state[cache] = None
+        return state
+
+    def columns(self) -> "PSSTColumns":
+        """A columnar NumPy view of this collection, built on first use."""
+        if self._columns is None:
+            from psstdata.columnar import PSSTColumns
+            object.__setattr__(self, "_columns", PSSTColumns.from_collection(self))
+        return self._columns
+
+    def encoded_transcripts(self) -> "PSSTEncodedTranscripts":
+        """Transcripts encoded with `VOCAB_ARPABET` into a padded int32 matrix plus lengths, built on first use."""
+        if self._encoded is None:
+            from psstdata.encoding import ArpabetEncoder
+            object.__setattr__(self, "_encoded", ArpabetEncoder.default().encode_collection(self))
+        return self._encoded
+
+    def compact(self) -> "PSSTUtteranceCollection":
+        """This collection with each utterance as a `PSSTCompactUtterance`, sharing one context per `root_dir`."""
+        splits = {}
+        return PSSTUtteranceCollection(tuple(
+            PSSTCompactUtterance.from_utterance(u, splits.setdefault(u.root_dir, PSSTSplitContext(u.root_dir)))
+            for u in self.utterances
+        ))
 
     def utterance_ids(self):
         return tuple(u.utterance_id for u in self.utterances)
 
     @classmethod
     def from_tsv(cls, tsv_file):
-        split_data = read_tsv(tsv_file, PSSTUtterance)
-        root_dir = os.path.dirname(tsv_file)
-        split_data = (dataclasses.replace(u, root_dir=root_dir) for u in split_data)
-        return cls(tuple(split_data))
+        return cls(tuple(iter_tsv(tsv_file, PSSTUtterance, root_dir=os.path.dirname(tsv_file))))
 
 
 @dataclass(frozen=True)
@@ -120,12 +417,10 @@ class PSSTData:
     test_is_placeholder: bool = False
 
     def __post_init__(self):
-        assert not set(self.train.sessions()).intersection(self.test.sessions()), \
-            "train/test have overlapping sessions!"
-        assert not set(self.train.sessions()).intersection(self.valid.sessions()), \
-            "train/valid have overlapping sessions!"
-        assert self.test_is_placeholder or not set(self.valid.sessions()).intersection(self.test.sessions()), \
-            "valid/test have overlapping sessions!"
+        train, valid, test = (frozenset(split.session_keys()) for split in self)
+        assert not train.intersection(test), "train/test have overlapping sessions!"
+        assert not train.intersection(valid), "train/valid have overlapping sessions!"
+        assert self.test_is_placeholder or not valid.intersection(test), "valid/test have overlapping sessions!"
 
     def __iter__(self):
         return iter((self.train, self.valid, self.test))
@@ -144,6 +439,17 @@ class PSSTSessionMetadata:
         return AQSeverity.from_score(self.aq_index)
 
 
+@dataclass(frozen=True)
+class PSSTSessionStats:
+    n_utterances: int
+    total_frames: int
+    severity: "AQSeverity"
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.total_frames / WAV_FRAME_RATE
+
+
 class AQSeverity(Enum):
     MILD = 100
     MODERATE = 75
@@ -162,6 +468,20 @@ class AQSeverity(Enum):
         except Exception as e:
             raise ValueError(f"Could not classify AQ score into severity: {e}")
 
+    @classmethod
+    def from_scores(cls, aq_index):
+        """
+        Vectorized `from_score`: bins an array of AQ scores into an integer array of `AQSeverity` values. NaN
+        scores, and scores `from_score` can't classify, map to `UNKNOWN`.
+        """
+        import numpy as np
+        aq_index = np.asarray(aq_index, dtype=np.float64)
+        bounds = np.array([s.value for s in (cls.VERY_SEVERE, cls.SEVERE, cls.MODERATE, cls.MILD)], dtype=np.float64)
+        bins = np.searchsorted(bounds, aq_index, side="right")
+        unknown = np.isnan(aq_index) | (bins == len(bounds))
+        values = np.append(bounds, cls.UNKNOWN.value).astype(np.int64)
+        return np.where(unknown, cls.UNKNOWN.value, values[np.minimum(bins, len(bounds))])
+
     def __str__(self):
         return self.name
 
@@ -1,25 +1,54 @@
+import contextlib
+import gzip
+import hashlib
+import json
 import os
 import shutil
 import tarfile
-from pathlib import Path
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from logging import INFO
-
-import requests
+from typing import Dict, Iterable, Tuple
 
 import psstdata
-import psstdata.networking
 from psstdata.config import PSSTSettings
+from psstdata.metrics import PSSTMetrics
 from psstdata.versioning import PSSTVersionCollection
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+REMOTE_VERSIONS_CACHE = ".versions-remote.json"
+PROGRESS_INTERVAL_SECONDS = 0.5
+REFLINK_IOCTL = 0x40049409  # Linux FICLONE: share a file's extents, on filesystems like btrfs and XFS
+
+
+def download(destination, version_id=None, offline=None, metrics: PSSTMetrics = None, extract_audio=None):
+    metrics = metrics or PSSTMetrics()
+    settings = PSSTSettings.load()
+    offline = settings.offline if offline is None else offline
+    extract_audio = settings.extract_audio if extract_audio is None else extract_audio
 
-def download(destination, version_id=None):
     local_versions = PSSTVersionCollection.from_disk(destination, suppress_warnings=True)
     if version_id in local_versions and local_versions[version_id].files["test"] is not None:
         return local_versions[version_id]
+    elif offline:
+        if version_id in local_versions:
+            return local_versions[version_id]
+        if version_id is not None or not any(local_versions):
+            raise PSSTDownloadError(f"Offline, and no data found in {os.path.abspath(destination)}", None)
+        return local_versions.latest()
     else:
+        import requests  # Deferred so that loading local data never imports the networking stack
         try:
-            result = psstdata.networking.request("GET", _url("versions.json")).json()
+            with metrics.phase("versions") as stats:
+                result = _remote_versions(destination, settings, stats)
+                if version_id is not None and all(v["version_id"] != version_id for v in result["versions"]):
+                    # Perhaps published since the cached list was fetched
+                    result = _remote_versions(destination, settings, stats, revalidate=True)
             remote_versions = PSSTVersionCollection.from_object(result, root_dir=destination).apply_dir(destination)
+            if version_id is not None and version_id not in remote_versions:
+                raise PSSTDownloadError(f"No data version {version_id} on the data server", None)
             version = remote_versions.latest() if version_id is None else remote_versions[version_id]
 
             if version_id is None and version.version_id in local_versions:
@@ -31,7 +60,7 @@ def download(destination, version_id=None):
             if version_id != "ARTIFICIAL":
                 remote_versions.save(destination)
 
-        except (requests.exceptions.ConnectionError, requests.HTTPError) as e:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.HTTPError) as e:
             if version_id in local_versions:
                 # Reachable only when .files["test"] is None. Past due for some unit testing here.
                 return local_versions[version_id]
@@ -45,59 +74,520 @@ def download(destination, version_id=None):
 
     psstdata.logger.info(f"Downloading a new data version: {version.version_id}")
 
-    for split, path in version.files.items():
-        if path is None:
-            continue
-        url = _url(path)
+    splits = {split: _url(path) for split, path in version.files.items() if path is not None}
+    manifests = {split: _url(path) for split, path in (version.manifests or {}).items() if path is not None}
+    previous = [v for v in local_versions.versions if v.version_id != version.version_id]
+    local_files = _local_files(previous) if extract_audio and manifests and previous else {}
+    n_jobs = max(1, min(PSSTSettings.load().parallel_n_jobs, len(splits)))
+    cancelled = threading.Event()
+    progress = _DownloadProgress(s for s in splits if not os.path.exists(os.path.join(version.local_dir(), s)))
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {
+            executor.submit(_download_split, version.local_dir(), split=split, url=url,
+                            cancelled=cancelled, progress=progress, metrics=metrics, extract_audio=extract_audio,
+                            manifest_url=manifests.get(split), local_files=local_files,
+                            size=(version.sizes or {}).get(split), checksum=(version.checksums or {}).get(split)): split
+            for split, url in splits.items()
+        }
         try:
-            _download_split(version.local_dir(), split=split, url=url)
-            psstdata.logger.info(f"Downloaded `{split}` to {version.local_dir()}.")
-        except FileExistsError as e:
-            psstdata.logger.info(f"Already `{split}` data in directory: {version.local_dir()}, skipping.")
-            continue
-        except Exception as e:
-            raise PSSTDownloadError(split, e) from e
+            for future in as_completed(futures):
+                split = futures[future]
+                try:
+                    future.result()
+                    psstdata.logger.info(f"Downloaded `{split}` to {version.local_dir()}.")
+                except FileExistsError as e:
+                    psstdata.logger.info(f"Already `{split}` data in directory: {version.local_dir()}, skipping.")
+                except PSSTDownloadCancelled:
+                    pass
+                except Exception as e:
+                    raise PSSTDownloadError(split, e) from e
+        except BaseException:
+            # Stop the other splits (on a failure or a Ctrl-C), and wait for them to clean up after themselves.
+            cancelled.set()
+            for other in futures:
+                other.cancel()
+            executor.shutdown(wait=True)
+            raise
 
     local_versions = PSSTVersionCollection.from_disk(destination, suppress_warnings=True)
     return local_versions[version.version_id]
 
 
-def _download_split(destination_folder, split: str, url: str):
+def _remote_versions(destination, settings: PSSTSettings, stats=None, revalidate: bool = False):
+    """
+    The remote `versions.json`, cached in `destination` for `settings.versions_ttl_seconds` (unless `revalidate`)
+    and then revalidated with If-None-Match/If-Modified-Since, so an unchanged file isn't downloaded again.
+    """
+    import psstdata.networking
+
+    cache_file = os.path.join(destination, REMOTE_VERSIONS_CACHE)
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = None
+
+    if not revalidate and cache is not None and time.time() - cache["fetched_at"] < settings.versions_ttl_seconds:
+        return cache["body"]
+
+    headers = {}
+    if cache is not None and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache is not None and cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+
+    response = psstdata.networking.request("GET", _url("versions.json"), headers=headers)
+    if response.status_code == 304 and cache is not None:
+        body = cache["body"]
+    else:
+        body = response.json()
+        if stats is not None:
+            stats.bytes += len(response.content)
+
+    cache = {
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag", cache and cache.get("etag")),
+        "last_modified": response.headers.get("Last-Modified", cache and cache.get("last_modified")),
+        "body": body,
+    }
+    try:
+        os.makedirs(destination, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        psstdata.logger.debug(f"Could not cache versions.json in {cache_file}: {e}")
+    return body
+
+
+def _download_split(destination_folder, split: str, url: str, cancelled: threading.Event = None, progress=None,
+                    size: int = None, checksum: str = None, metrics: PSSTMetrics = None, extract_audio: bool = True,
+                    manifest_url: str = None, local_files: Dict[Tuple[int, str], str] = None):
     split_destination = os.path.join(destination_folder, split)
     if os.path.exists(split_destination):
         raise FileExistsError(split_destination)
 
-    incomplete = os.path.join(destination_folder, "incomplete")
+    cancelled = cancelled or threading.Event()
+    progress = progress or _DownloadProgress()
+    metrics = metrics or PSSTMetrics()
+
+    if manifest_url is not None and local_files:
+        try:
+            _upgrade_split(destination_folder, split, manifest_url, local_files, cancelled, progress, metrics)
+            return
+        except PSSTIncrementalUnavailable as e:
+            psstdata.logger.info(f"{e}, downloading it in full.")
+
+    archive = _fetch_archive(destination_folder, split, url, cancelled, progress, size=size, checksum=checksum,
+                             metrics=metrics)
 
-    with psstdata.networking.request("GET", url, stream=True) as response:
-        content_length = response.raw.length_remaining
-        with tarfile.open(fileobj=response.raw, mode="r:gz") as t:
+    if not extract_audio:
+        with _removed_if_corrupt(archive, split):
+            _archive_split(archive, split, split_destination, cancelled, metrics)
+        os.remove(archive)
+        return
+
+    # Extract beside the destination and rename into place, so `split_destination` only ever appears complete.
+    incomplete = os.path.join(destination_folder, f"incomplete-{split}")
+    try:
+        with _removed_if_corrupt(archive, split), metrics.phase(f"extract:{split}") as stats, \
+                _TimedReader(gzip.open(archive), metrics, f"decompress:{split}") as stream, \
+                tarfile.open(fileobj=stream, mode="r|") as t:
             def itermembers():
                 for tarinfo in t:
-                    _log_progress(content_length, response.raw.length_remaining, split)
+                    if cancelled.is_set():
+                        raise PSSTDownloadCancelled(split)
+                    stats.members += 1
+                    stats.bytes += tarinfo.size
                     yield tarinfo
             t.extractall(incomplete, itermembers())
-            _log_progress(content_length, 0, split)
+        os.replace(os.path.join(incomplete, split), split_destination)
+    finally:
+        shutil.rmtree(incomplete, ignore_errors=True)
+    os.remove(archive)
+
+
+@contextlib.contextmanager
+def _removed_if_corrupt(archive, split: str):
+    """Delete `archive` if it can't be decompressed or read as a tar file, so the next attempt downloads it again."""
+    try:
+        yield
+    except (EOFError, gzip.BadGzipFile, tarfile.TarError, zlib.error) as e:
+        psstdata.logger.warning(f"Archive of `{split}` is corrupt, removing it: {type(e).__name__}: {e}")
+        _remove(archive)
+        raise
 
-    shutil.move(os.path.join(incomplete, split), destination_folder)
-    Path(os.path.join(incomplete, ".DS_Store")).unlink(missing_ok=True)
-    os.rmdir(incomplete)
 
+def _archive_split(archive, split: str, split_destination: str, cancelled: threading.Event, metrics: PSSTMetrics):
+    """
+    Instead of extracting a split, decompress its archive to `<split>/audio.tar` and index the members, extracting only
+    `utterances.tsv`. See `psstdata.archives.PSSTAudioArchive`.
+    """
+    import numpy as np
+    from psstdata.archives import ARCHIVE_FILENAME, ARCHIVE_FORMAT, ARCHIVE_INDEX_FILENAME, METADATA_FILENAMES
 
-def _log_progress(content_length, length_remaining, split):
+    incomplete = os.path.join(os.path.dirname(split_destination), f"incomplete-{split}")
+    tar_file = os.path.join(incomplete, ARCHIVE_FILENAME)
     try:
-        percent_complete = 100 * (content_length - length_remaining) / content_length
-        if psstdata.logger.level <= INFO:
-            for logger_handler in psstdata.logger.handlers:
-                logger_handler.stream.flush()
-                logger_handler.stream.write(
-                    f"\rDownloading & extracting `{split}` "
-                    f"({percent_complete:.0f}% complete of {content_length * 1024**-2:.0f}MB)"
-                )
-                if length_remaining == 0:
-                    logger_handler.stream.write("\n")
-    except:
+        os.makedirs(incomplete, exist_ok=True)
+        with _TimedReader(gzip.open(archive), metrics, f"decompress:{split}") as source, open(tar_file, "wb") as f:
+            for chunk in iter(lambda: source.read(DOWNLOAD_CHUNK_SIZE), b""):
+                if cancelled.is_set():
+                    raise PSSTDownloadCancelled(split)
+                f.write(chunk)
+
+        filenames, offsets, sizes = [], [], []
+        with metrics.phase(f"extract:{split}") as stats, tarfile.open(tar_file, mode="r:") as t:
+            for tarinfo in t:
+                if not tarinfo.isfile() or not tarinfo.name.startswith(f"{split}/"):
+                    continue
+                filename = tarinfo.name[len(split) + 1:]
+                if filename in METADATA_FILENAMES:
+                    with t.extractfile(tarinfo) as member, open(os.path.join(incomplete, filename), "wb") as f:
+                        shutil.copyfileobj(member, f)
+                    stats.bytes += tarinfo.size
+                filenames.append(filename)
+                offsets.append(tarinfo.offset_data)
+                sizes.append(tarinfo.size)
+                stats.members += 1
+
+        np.savez(
+            os.path.join(incomplete, ARCHIVE_INDEX_FILENAME),
+            format=ARCHIVE_FORMAT,
+            filenames=np.array(filenames, dtype=str),
+            offsets=np.array(offsets, dtype=np.int64),
+            sizes=np.array(sizes, dtype=np.int64),
+        )
+        os.replace(incomplete, split_destination)
+    finally:
+        shutil.rmtree(incomplete, ignore_errors=True)
+
+
+def _local_files(versions) -> Dict[Tuple[int, str], str]:
+    """
+    The path of every file in `versions` (most recent first) by its (size, sha256), from the manifests written by
+    `psstdata.verification.verify()`. Files modified since they were hashed are left out. Only the most recent
+    version is hashed if it has no manifests yet, and only where they can be written.
+
+    Never raises: reusing files is only an optimization, and without them each split is downloaded in full.
+    """
+    try:
+        from psstdata.verification import MANIFEST_HASH, read_manifest, verify
+
+        files = {}
+        for i, version in enumerate(versions):
+            root_dirs = [os.path.dirname(tsv) for tsv in version.tsv_files().values() if tsv is not None]
+            if not all(read_manifest(root_dir) for root_dir in root_dirs):
+                if i == 0 and all(os.access(root_dir, os.W_OK) for root_dir in root_dirs):
+                    psstdata.logger.info(f"Hashing data version {version.version_id}, "
+                                         f"to find files the new version shares")
+                    verify(version.version_id, local_dir=version.root_dir)
+                else:
+                    psstdata.logger.debug(f"Not hashing data version {version.version_id}, to find shared files")
+            for root_dir in root_dirs:
+                for filename, entry in read_manifest(root_dir).items():
+                    path = os.path.join(root_dir, filename)
+                    try:
+                        stat = os.stat(path)  # Missing when the version keeps its audio in `audio.tar`
+                    except FileNotFoundError:
+                        continue
+                    if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                        files.setdefault((entry["size"], entry[MANIFEST_HASH]), path)
+        return files
+    except Exception as e:
+        psstdata.logger.info(f"Can't reuse files from earlier data versions, downloading in full. "
+                             f"{type(e).__name__}: {e}")
+        return {}
+
+
+def _upgrade_split(destination_folder, split: str, manifest_url: str, local_files: Dict[Tuple[int, str], str],
+                   cancelled: threading.Event, progress, metrics: PSSTMetrics):
+    """
+    Build a split from files already on disk, following the server's manifest for it:
+
+        {"hash": "sha256", "base_path": "<path of the split's files>", "files": {filename: {"size", "sha256"}}}
+
+    Files found in `local_files` are hard-linked (or reflinked, or copied, across filesystems); the rest are fetched
+    one by one from `<base_path>/<filename>`. Writes the split's `manifest.json` as it goes, so the next upgrade
+    needn't hash it. Raises `PSSTIncrementalUnavailable` when the server can't provide what's needed.
+    """
+    import requests
+    import psstdata.networking
+    from psstdata.verification import MANIFEST_HASH, write_manifest
+
+    try:
+        with metrics.phase(f"network:{split}") as stats:
+            response = psstdata.networking.request("GET", manifest_url)
+            stats.bytes += len(response.content)
+            remote = response.json()
+    except (requests.HTTPError, ValueError) as e:
+        raise PSSTIncrementalUnavailable(split, f"no manifest ({e})") from e
+    if remote.get("hash") != MANIFEST_HASH:
+        raise PSSTIncrementalUnavailable(split, f"unsupported manifest hash {remote.get('hash')!r}")
+
+    files = remote["files"]
+    if any(os.path.isabs(f) or ".." in f.split("/") for f in files):
+        raise PSSTIncrementalUnavailable(split, "manifest has paths outside the split")
+    changed = {f: entry for f, entry in files.items() if (entry["size"], entry[MANIFEST_HASH]) not in local_files}
+    if len(changed) == len(files):
+        raise PSSTIncrementalUnavailable(split, "no files in common with local versions")
+    base_path = remote.get("base_path")
+    if changed and not base_path:
+        raise PSSTIncrementalUnavailable(split, "server doesn't publish individual files")
+    psstdata.logger.info(f"Upgrading `{split}`: reusing {len(files) - len(changed)} local files, "
+                         f"fetching {len(changed)}.")
+
+    split_destination = os.path.join(destination_folder, split)
+    incomplete = os.path.join(destination_folder, f"incomplete-{split}")
+    shutil.rmtree(incomplete, ignore_errors=True)
+    try:
+        with metrics.phase(f"link:{split}") as stats:
+            for filename, entry in files.items():
+                if filename in changed:
+                    continue
+                if cancelled.is_set():
+                    raise PSSTDownloadCancelled(split)
+                target = os.path.join(incomplete, filename)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                _link_or_copy(local_files[(entry["size"], entry[MANIFEST_HASH])], target)
+                stats.members += 1
+                stats.bytes += entry["size"]
+
+        total = remaining = sum(entry["size"] for entry in changed.values())
+        with metrics.phase(f"network:{split}") as stats:
+            for filename, entry in changed.items():
+                target = os.path.join(incomplete, filename)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                digest = hashlib.new(MANIFEST_HASH)
+                try:
+                    with psstdata.networking.request("GET", _url(f"{base_path.rstrip('/')}/{filename}"),
+                                                     stream=True) as response, open(target, "wb") as f:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            if cancelled.is_set():
+                                raise PSSTDownloadCancelled(split)
+                            f.write(chunk)
+                            digest.update(chunk)
+                            stats.bytes += len(chunk)
+                except requests.HTTPError as e:
+                    raise PSSTIncrementalUnavailable(split, f"couldn't fetch {filename} ({e})") from e
+                if digest.hexdigest() != entry[MANIFEST_HASH]:
+                    raise PSSTIncrementalUnavailable(split, f"{filename} failed its {MANIFEST_HASH} checksum")
+                stats.members += 1
+                remaining -= entry["size"]
+                progress.update(split, total, remaining)
+        progress.update(split, total, 0)  # Also when every file was linked
+
+        write_manifest(incomplete, {
+            filename: {"size": entry["size"], "mtime_ns": os.stat(os.path.join(incomplete, filename)).st_mtime_ns,
+                       MANIFEST_HASH: entry[MANIFEST_HASH]}
+            for filename, entry in files.items()
+        })
+        os.replace(incomplete, split_destination)
+    finally:
+        shutil.rmtree(incomplete, ignore_errors=True)
+
+
+def _link_or_copy(source, target):
+    """Hard-link `source` to `target`, or where that fails (e.g. across filesystems), reflink or copy it."""
+    try:
+        os.link(source, target)
+        return
+    except OSError:
         pass
+    try:
+        import fcntl
+        with open(source, "rb") as s, open(target, "wb") as t:
+            fcntl.ioctl(t.fileno(), REFLINK_IOCTL, s.fileno())
+        shutil.copystat(source, target)
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copy2(source, target)
+
+
+def _fetch_archive(destination_folder, split: str, url: str, cancelled: threading.Event, progress,
+                   size: int = None, checksum: str = None, metrics: PSSTMetrics = None):
+    """
+    Spool a split's archive to `<split>.tar.gz.partial`, resuming a previous attempt with an HTTP Range request,
+    then verify its size (and checksum, if known) before renaming it to `<split>.tar.gz`.
+
+    The archive's validator (its ETag, or else Last-Modified) is saved to `<split>.tar.gz.partial.validator` when
+    spooling starts, and a resume sends it as If-Range: if the archive has changed since, the server sends all of it
+    and the download restarts. A partial file without a validator is never resumed.
+    """
+    import requests
+    import psstdata.networking
+
+    metrics = metrics or PSSTMetrics()
+    os.makedirs(destination_folder, exist_ok=True)
+    partial = os.path.join(destination_folder, f"{split}.tar.gz.partial")
+    validator_file = f"{partial}.validator"
+    archive = os.path.join(destination_folder, f"{split}.tar.gz")
+    if os.path.exists(archive):
+        progress.update(split, os.path.getsize(archive), 0)
+        return archive  # Verified on an earlier run, but not extracted
+
+    validator = _read_validator(validator_file) if os.path.exists(partial) else None
+    offset = os.path.getsize(partial) if validator else 0
+    headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset else {}
+    total = size
+    try:
+        with metrics.phase(f"network:{split}") as stats, \
+                psstdata.networking.request("GET", url, stream=True, headers=headers) as response:
+            if offset and response.status_code != 206:
+                psstdata.logger.info(f"Can't resume `{split}` (changed on the server, or no Range support), "
+                                     f"restarting download.")
+                offset = 0
+            elif offset:
+                psstdata.logger.info(f"Resuming `{split}` download at {offset * 1024**-2:.0f}MB.")
+            if not offset:
+                _write_validator(validator_file, response)
+            if total is None:
+                total = _content_total(response, offset)
+            with open(partial, "ab" if offset else "wb") as f:
+                for chunk in response.raw.stream(DOWNLOAD_CHUNK_SIZE, decode_content=False):
+                    if cancelled.is_set():
+                        raise PSSTDownloadCancelled(split)
+                    f.write(chunk)
+                    stats.bytes += len(chunk)
+                    progress.update(split, total, None if total is None else total - f.tell())
+    except requests.HTTPError as e:
+        # 416: the partial file already holds everything the server has. Verify it below.
+        if not offset or e.response is None or e.response.status_code != 416:
+            raise
+
+    with metrics.phase(f"verify:{split}") as stats:
+        _verify_archive(partial, split, size=total, checksum=checksum)
+        stats.bytes += os.path.getsize(partial) if checksum else 0
+    os.replace(partial, archive)
+    _remove(validator_file)
+    progress.update(split, os.path.getsize(archive), 0)
+    return archive
+
+
+def _read_validator(validator_file):
+    try:
+        with open(validator_file) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_validator(validator_file, response):
+    # Weak ETags can't be used in If-Range.
+    etag = response.headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    if validator:
+        with open(validator_file, "w") as f:
+            f.write(validator)
+    else:
+        _remove(validator_file)
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
+def _content_total(response, offset):
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    if "Content-Length" in response.headers:
+        return offset + int(response.headers["Content-Length"])
+    return None
+
+
+def _verify_archive(filename, split, size=None, checksum=None):
+    actual_size = os.path.getsize(filename)
+    if size is not None and actual_size != size:
+        if actual_size > size:
+            os.remove(filename)
+        raise PSSTDownloadError(f"Downloaded `{split}` is {actual_size} bytes, expected {size}", None)
+    if checksum:
+        algorithm, _, expected = checksum.rpartition(":")
+        digest = hashlib.new(algorithm or "sha256")
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        if digest.hexdigest().lower() != expected.lower():
+            os.remove(filename)
+            raise PSSTDownloadError(f"Downloaded `{split}` failed its {digest.name} checksum", None)
+
+
+class _TimedReader:
+    """A file wrapper that adds the time and bytes of every `read()` to the stats of phase `name`."""
+
+    def __init__(self, f, metrics: PSSTMetrics, name: str):
+        self.f = f
+        self.metrics = metrics
+        self.stats = metrics.stats(name)
+
+    def read(self, size=-1):
+        start = time.perf_counter()
+        data = self.f.read(size)
+        self.stats.seconds += time.perf_counter() - start
+        self.stats.bytes += len(data)
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.f.close()
+        self.stats.calls += 1
+        if self.metrics.callback is not None:
+            self.metrics.callback(self.stats)
+
+
+class _DownloadProgress:
+    """
+    Reports download progress for every split in flight on a single status line, at most once every
+    `interval` seconds, plus whenever a split completes. The line is finished once every split in `splits` (and
+    any other split that reports) is complete.
+    """
+
+    def __init__(self, splits: Iterable[str] = (), interval: float = PROGRESS_INTERVAL_SECONDS):
+        self._lock = threading.Lock()
+        self._splits = set(splits)
+        self._percent = {}
+        self._finished = False
+        self._interval = interval
+        self._last_report = None
+
+    def update(self, split, content_length, length_remaining):
+        try:
+            if content_length == 0 and length_remaining == 0:
+                percent_complete = 100.0
+            else:
+                percent_complete = 100 * (content_length - length_remaining) / content_length
+        except (TypeError, ZeroDivisionError):
+            return
+        with self._lock:
+            completed = percent_complete >= 100 > self._percent.get(split, (0, None))[0]
+            self._percent[split] = (percent_complete, content_length)
+            if psstdata.logger.level > INFO or self._finished:
+                return
+            done = all(self._percent.get(s, (0, None))[0] >= 100 for s in self._splits.union(self._percent))
+            now = time.monotonic()
+            if not (done or completed) and self._last_report is not None and now - self._last_report < self._interval:
+                return
+            self._last_report = now
+            self._finished = done
+            status = ", ".join(
+                f"`{s}` ({p:.0f}% complete of {length * 1024**-2:.0f}MB)"
+                for s, (p, length) in self._percent.items()
+            )
+            for logger_handler in psstdata.logger.handlers:
+                try:
+                    logger_handler.stream.write(f"\rDownloading {status}")
+                    if done:
+                        logger_handler.stream.write("\n")
+                    logger_handler.stream.flush()
+                except AttributeError:
+                    pass
 
 
 def _url(path):
@@ -116,6 +606,23 @@ class PSSTDownloadError(Exception):
         return self.message
 
 
+class PSSTDownloadCancelled(Exception):
+    def __init__(self, split):
+        self.split = split
+
+    def __str__(self):
+        return f"Download of `{self.split}` was cancelled"
+
+
+class PSSTIncrementalUnavailable(Exception):
+    def __init__(self, split, reason):
+        self.split = split
+        self.reason = reason
+
+    def __str__(self):
+        return f"Can't upgrade `{self.split}` incrementally: {self.reason}"
+
+
 class PSSTDataUnavailableError(Exception):
     def __init__(self, split):
         self.split = split
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Sequence, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from psstdata.tasks import PAD, UNK
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTEncodedTranscripts:
+    """
+    Integer-encoded ARPAbet transcripts for a collection.
+
+    ids (np.ndarray):       int32, shape (utterances, longest transcript), padded with the `PAD` id
+    lengths (np.ndarray):   int32, the number of phonemes in each transcript
+    """
+    utterance_ids: Tuple[str, ...]
+    ids: np.ndarray
+    lengths: np.ndarray
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+class ArpabetEncoder:
+    """
+    Encodes space-separated ARPAbet transcripts to padded id matrices, and decodes them back. Phonemes missing from
+    the vocabulary encode to `UNK`; `SIL` and `SPN` are ordinary vocabulary entries.
+    """
+
+    def __init__(self, vocab: Dict[str, int]):
+        self.vocab = dict(vocab)
+        self.pad_id = self.vocab[PAD]
+        self.unk_id = self.vocab[UNK]
+        self.tokens = np.empty(max(self.vocab.values()) + 1, dtype=object)
+        for token, i in self.vocab.items():
+            self.tokens[i] = token
+
+    @classmethod
+    @lru_cache()
+    def default(cls) -> "ArpabetEncoder":
+        """The encoder for `psstdata.VOCAB_ARPABET`."""
+        from psstdata.tasks import VOCAB_ARPABET
+        return cls(VOCAB_ARPABET)
+
+    def encode(self, transcripts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode transcripts to an int32 id matrix padded with `PAD`, and an int32 array of lengths."""
+        split = [t.split() for t in transcripts]
+        lengths = np.fromiter((len(s) for s in split), dtype=np.int32, count=len(split))
+        lookup = self.vocab.get
+        unk_id = self.unk_id
+        flat = np.fromiter((lookup(p, unk_id) for s in split for p in s), dtype=np.int32, count=int(lengths.sum()))
+        ids = np.full((len(split), lengths.max(initial=0)), self.pad_id, dtype=np.int32)
+        ids[np.arange(ids.shape[1]) < lengths[:, None]] = flat
+        return ids, lengths
+
+    def decode(self, ids: np.ndarray, lengths: np.ndarray = None) -> List[str]:
+        """
+        Decode an id matrix (or a sequence of id arrays) back to space-separated transcripts. Without `lengths`,
+        `PAD` ids are dropped.
+        """
+        if lengths is None:
+            rows = [np.asarray(row) for row in ids]
+            rows = [row[row != self.pad_id] for row in rows]
+        else:
+            rows = [np.asarray(row)[:length] for row, length in zip(ids, lengths)]
+        return [" ".join(self.tokens[row]) for row in rows]
+
+    def encode_collection(self, collection: "PSSTUtteranceCollection") -> PSSTEncodedTranscripts:
+        ids, lengths = self.encode([u.transcript for u in collection])
+        return PSSTEncodedTranscripts(collection.utterance_ids(), ids, lengths)
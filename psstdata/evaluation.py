@@ -0,0 +1,168 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Mapping, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from psstdata.encoding import ArpabetEncoder
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTUtteranceCollection, AQSeverity
+
+
+@dataclass(frozen=True)
+class PSSTErrorRates:
+    """
+    Corpus-level error rates: total edit cost divided by total reference length.
+    """
+    per: float
+    fer: float
+    n_utterances: int
+    n_phonemes: int
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTEvaluation:
+    """
+    Phoneme (and optionally feature) error rates for a collection, with per-utterance costs and breakdowns.
+
+    phoneme_errors (np.ndarray):    the Levenshtein distance between each reference and hypothesis
+    feature_errors (np.ndarray):    the feature-weighted edit distance (NaN without a feature table)
+    reference_lengths (np.ndarray): the number of phonemes in each reference transcript
+    """
+    utterance_ids: Tuple[str, ...]
+    phoneme_errors: np.ndarray
+    feature_errors: np.ndarray
+    reference_lengths: np.ndarray
+    overall: PSSTErrorRates
+    by_session: Dict[str, PSSTErrorRates]
+    by_severity: Dict["AQSeverity", PSSTErrorRates]
+
+
+def edit_distances(
+        reference: np.ndarray,
+        reference_lengths: np.ndarray,
+        hypothesis: np.ndarray,
+        hypothesis_lengths: np.ndarray,
+        substitution_costs: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Batched Levenshtein distance between rows of two padded id matrices.
+
+    The DP runs one reference position at a time, vectorized over the batch and the hypothesis positions. Within a
+    row, insertions are resolved with a running minimum. `substitution_costs[a, b]` optionally replaces the unit
+    cost of substituting id `a` with `b`. Insertions and deletions always cost 1.
+    """
+    n_batch, n_reference = reference.shape
+    n_hypothesis = hypothesis.shape[1]
+    columns = np.arange(n_hypothesis + 1, dtype=np.float64)
+
+    previous = np.broadcast_to(columns, (n_batch, n_hypothesis + 1)).copy()
+    distances = previous[np.arange(n_batch), hypothesis_lengths].copy()
+    for i in range(n_reference):
+        if substitution_costs is None:
+            substitution = (reference[:, i, None] != hypothesis).astype(np.float64)
+        else:
+            substitution = substitution_costs[reference[:, i, None], hypothesis]
+        current = np.empty_like(previous)
+        current[:, 0] = i + 1
+        current[:, 1:] = np.minimum(previous[:, 1:] + 1, previous[:, :-1] + substitution)
+        # Insertions: current[j] = min over k <= j of current[k] + (j - k)
+        current = np.minimum.accumulate(current - columns, axis=1) + columns
+        done = reference_lengths == i + 1
+        distances[done] = current[done, hypothesis_lengths[done]]
+        previous = current
+    return distances
+
+
+def feature_substitution_costs(encoder: ArpabetEncoder, features: Mapping[str, Sequence[float]]) -> np.ndarray:
+    """
+    Substitution costs for feature error rate (FER): the fraction of phonological features that differ between two
+    phonemes. Tokens without features (e.g. `<unk>`) cost 1 to substitute for anything other than themselves.
+    """
+    n_tokens = len(encoder.tokens)
+    n_features = len(next(iter(features.values())))
+    table = np.full((n_tokens, n_features), np.nan)
+    for token, i in encoder.vocab.items():
+        if token in features:
+            table[i] = features[token]
+    costs = np.mean(table[:, None, :] != table[None, :, :], axis=2)
+    missing = np.isnan(table).any(axis=1)
+    costs[missing, :] = 1
+    costs[:, missing] = 1
+    np.fill_diagonal(costs, 0)
+    return costs
+
+
+def evaluate(
+        collection: "PSSTUtteranceCollection",
+        hypotheses: Mapping[str, str],
+        *,
+        features: Mapping[str, Sequence[float]] = None,
+        encoder: ArpabetEncoder = None,
+        n_jobs: int = 1,
+        shard_size: int = 10000,
+) -> PSSTEvaluation:
+    """
+    Score ARPAbet `hypotheses` (by `utterance_id`) against every utterance's transcript in `collection`.
+
+    PER is always computed. FER is computed when `features` maps each phoneme to a vector of phonological
+    features. Work is split into shards of `shard_size` utterances, spread over `n_jobs` processes when
+    `n_jobs > 1`.
+    """
+    encoder = encoder or ArpabetEncoder.default()
+    missing = [u.utterance_id for u in collection if u.utterance_id not in hypotheses]
+    if missing:
+        raise KeyError(f"No hypothesis for {len(missing)} utterances, e.g. {missing[0]}")
+
+    encoded = collection.encoded_transcripts() if encoder is ArpabetEncoder.default() \
+        else encoder.encode_collection(collection)
+    hypothesis_ids, hypothesis_lengths = encoder.encode([hypotheses[u] for u in encoded.utterance_ids])
+    feature_costs = None if features is None else feature_substitution_costs(encoder, features)
+
+    shards = [
+        (encoded.ids[start:start + shard_size], encoded.lengths[start:start + shard_size],
+         hypothesis_ids[start:start + shard_size], hypothesis_lengths[start:start + shard_size], feature_costs)
+        for start in range(0, len(encoded), shard_size)
+    ]
+    if n_jobs > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_score_shard, shards))
+    else:
+        results = [_score_shard(shard) for shard in shards]
+
+    phoneme_errors = np.concatenate([r[0] for r in results]) if results else np.zeros(0)
+    feature_errors = np.concatenate([r[1] for r in results]) if results else np.zeros(0)
+    reference_lengths = encoded.lengths.astype(np.int64)
+
+    def rates(mask) -> PSSTErrorRates:
+        n_phonemes = int(reference_lengths[mask].sum())
+        return PSSTErrorRates(
+            per=float(phoneme_errors[mask].sum() / n_phonemes) if n_phonemes else float("nan"),
+            fer=float(feature_errors[mask].sum() / n_phonemes) if n_phonemes else float("nan"),
+            n_utterances=int(np.count_nonzero(mask)),
+            n_phonemes=n_phonemes,
+        )
+
+    from psstdata.datastructures import AQSeverity
+    columns = collection.columns()
+    severities = columns.severity
+    return PSSTEvaluation(
+        utterance_ids=encoded.utterance_ids,
+        phoneme_errors=phoneme_errors,
+        feature_errors=feature_errors,
+        reference_lengths=reference_lengths,
+        overall=rates(np.ones(len(collection), dtype=bool)),
+        by_session={session: rates(columns.session == session) for session in columns.session.categories},
+        by_severity={AQSeverity(value): rates(severities == value) for value in np.unique(severities).tolist()},
+    )
+
+
+def _score_shard(shard):
+    reference, reference_lengths, hypothesis, hypothesis_lengths, feature_costs = shard
+    phoneme_errors = edit_distances(reference, reference_lengths, hypothesis, hypothesis_lengths)
+    if feature_costs is None:
+        feature_errors = np.full(len(phoneme_errors), np.nan)
+    else:
+        feature_errors = edit_distances(reference, reference_lengths, hypothesis, hypothesis_lengths, feature_costs)
+    return phoneme_errors, feature_errors
@@ -0,0 +1,200 @@
+"""
+Columnar export and import of splits, for analytics and training jobs that want to read metadata without building
+`PSSTUtterance` objects.
+
+Every `PSSTUtterance` field is written, plus `severity` (the integer `AQSeverity` value derived from `aq_index`), as:
+
+    parquet     `<split>.parquet`, with pyarrow
+    arrow       `<split>.arrow`, an Arrow IPC file, with pyarrow
+    numpy       `<split>.columns/`, one `.npy` file per column plus `columns.json`, with nothing but NumPy
+
+Arrow IPC and NumPy bundles are memory-mapped when read back, so numeric columns and category codes are zero-copy.
+"""
+import dataclasses
+import json
+import os
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+from psstdata.columnar import CATEGORICAL_COLUMNS, STRING_COLUMNS, PSSTCategorical, PSSTColumns
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTData, PSSTUtteranceCollection
+
+EXPORT_FORMATS = ("parquet", "arrow", "numpy")
+EXPORT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "numpy": ".columns"}
+NUMPY_BUNDLE_METADATA = "columns.json"
+NUMPY_BUNDLE_FORMAT = 1
+
+NUMERIC_COLUMNS = {"correctness": np.bool_, "aq_index": np.float64, "duration_frames": np.int64, "severity": np.int8}
+
+
+def default_format() -> str:
+    """`parquet` when pyarrow is installed, otherwise `numpy`."""
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "numpy"
+
+
+def export_split(collection: "PSSTUtteranceCollection", path: str, format: str = None) -> str:
+    """Write a collection's columns to `path` (a file, or a directory for `numpy`), and return `path`."""
+    format = format or default_format()
+    columns = collection.columns()
+    root_dir = PSSTCategorical.from_values(["" if r is None else r for r in columns.root_dir.tolist()])
+    arrays = {
+        "utterance_id": columns.utterance_id,
+        "session": columns.session,
+        "test": columns.test,
+        "prompt": columns.prompt,
+        "transcript": columns.transcript,
+        "correctness": columns.correctness,
+        "aq_index": columns.aq_index,
+        "duration_frames": columns.duration_frames,
+        "filename": columns.filename,
+        "root_dir": root_dir,
+        "severity": columns.severity.astype(np.int8),
+    }
+    if format == "numpy":
+        _write_numpy(arrays, path)
+    elif format in ("parquet", "arrow"):
+        _write_arrow(arrays, path, format)
+    else:
+        raise ValueError(f"Unknown export format {format!r}; expected one of {EXPORT_FORMATS}")
+    return path
+
+
+def export(data: "PSSTData", directory: str, format: str = None) -> Dict[str, str]:
+    """Export every split of `data` to `<directory>/<split>.<extension>`, returning the paths by split."""
+    format = format or default_format()
+    os.makedirs(directory, exist_ok=True)
+    splits = ("train", "valid", "test")
+    return {
+        split: export_split(getattr(data, split), os.path.join(directory, f"{split}{EXPORT_EXTENSIONS[format]}"), format)
+        for split in splits
+    }
+
+
+def read_columns(path: str, format: str = None) -> PSSTColumns:
+    """Read exported columns, memory-mapped where the format allows. `format` is inferred from `path` if omitted."""
+    format = format or _infer_format(path)
+    if format == "numpy":
+        arrays = _read_numpy(path)
+    elif format in ("parquet", "arrow"):
+        arrays = _read_arrow(path, format)
+    else:
+        raise ValueError(f"Unknown export format {format!r}; expected one of {EXPORT_FORMATS}")
+    arrays.pop("severity", None)  # Derived from aq_index by `PSSTColumns.severity`
+    root_dir = arrays["root_dir"]
+    arrays["root_dir"] = np.asarray([r or None for r in root_dir.categories], dtype=object)[root_dir.codes]
+    return PSSTColumns(**arrays)
+
+
+def import_split(path: str, format: str = None, root_dir: str = None) -> "PSSTUtteranceCollection":
+    """
+    Read exported columns back into a `PSSTUtteranceCollection`. Pass `root_dir` if the split's audio has moved
+    since it was exported.
+    """
+    columns = read_columns(path, format)
+    if root_dir is not None:
+        columns = dataclasses.replace(columns, root_dir=np.full(len(columns), root_dir, dtype=object))
+    return columns.to_collection()
+
+
+def _infer_format(path: str) -> str:
+    for format, extension in EXPORT_EXTENSIONS.items():
+        if path.rstrip(os.sep).endswith(extension):
+            return format
+    if os.path.isdir(path):
+        return "numpy"
+    raise ValueError(f"Can't tell the export format of {path}; pass `format`")
+
+
+def _write_numpy(arrays, directory: str):
+    os.makedirs(directory, exist_ok=True)
+    metadata = {"format": NUMPY_BUNDLE_FORMAT, "length": len(arrays["utterance_id"]), "categories": {}}
+    for name, array in arrays.items():
+        if isinstance(array, PSSTCategorical):
+            metadata["categories"][name] = list(array.categories)
+            array = array.codes
+        elif name in STRING_COLUMNS:
+            array = np.array(array.tolist(), dtype=str)  # Fixed-width unicode, so it can be memory-mapped
+        np.save(os.path.join(directory, f"{name}.npy"), array, allow_pickle=False)
+    with open(os.path.join(directory, NUMPY_BUNDLE_METADATA), "w") as f:
+        json.dump(metadata, f, indent=1)
+
+
+def _read_numpy(directory: str):
+    with open(os.path.join(directory, NUMPY_BUNDLE_METADATA)) as f:
+        metadata = json.load(f)
+    if metadata["format"] != NUMPY_BUNDLE_FORMAT:
+        raise ValueError(f"Unknown NumPy bundle format {metadata['format']} in {directory}")
+    # Zero-length arrays can't be memory-mapped
+    mmap_mode = "r" if metadata["length"] else None
+    arrays = {}
+    for name in (*CATEGORICAL_COLUMNS, *STRING_COLUMNS, *NUMERIC_COLUMNS):
+        array = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        if name in metadata["categories"]:
+            array = PSSTCategorical(array, tuple(metadata["categories"][name]))
+        arrays[name] = array
+    return arrays
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet and Arrow exports need pyarrow: `pip install psstdata[arrow]`, "
+                          "or use format='numpy'") from e
+
+
+def _write_arrow(arrays, path: str, format: str):
+    pa = _pyarrow()
+
+    def column(name, array):
+        if isinstance(array, PSSTCategorical):
+            return pa.DictionaryArray.from_arrays(pa.array(array.codes, pa.int32()), pa.array(array.categories, pa.string()))
+        if name in STRING_COLUMNS:
+            return pa.array(array.tolist(), pa.string())
+        if name == "aq_index":
+            return pa.array(array, pa.float64(), mask=np.isnan(array))
+        return pa.array(array)
+
+    table = pa.table({name: column(name, array) for name, array in arrays.items()})
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_arrow(path: str, format: str):
+    pa = _pyarrow()
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+    arrays = {}
+    for name in (*CATEGORICAL_COLUMNS, *STRING_COLUMNS, *NUMERIC_COLUMNS):
+        column = table.column(name).combine_chunks()
+        if name in CATEGORICAL_COLUMNS:
+            if not pa.types.is_dictionary(column.type):
+                column = column.dictionary_encode()
+            arrays[name] = PSSTCategorical(_to_numpy(column.indices, np.int32), tuple(column.dictionary.to_pylist()))
+        elif name in STRING_COLUMNS:
+            arrays[name] = column.to_numpy(zero_copy_only=False)
+        else:
+            arrays[name] = _to_numpy(column, NUMERIC_COLUMNS[name])
+    return arrays
+
+
+def _to_numpy(column, dtype) -> np.ndarray:
+    # Zero-copy for fixed-width columns without nulls; nulls (a missing `aq_index`) become NaN.
+    return np.asarray(column.to_numpy(zero_copy_only=False), dtype=dtype)
@@ -0,0 +1,294 @@
+import dataclasses
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+import psstdata
+from psstdata import WAV_FRAME_RATE
+from psstdata.archives import PSSTAudioArchive
+from psstdata.audio import read_audio
+from psstdata.datastructures import PSSTData, PSSTUtteranceCollection
+from psstdata.versioning import PSSTVersion
+
+FEATURES_DATA_FILENAME = "features.f32"
+FEATURES_INDEX_FILENAME = "index.npz"
+FEATURES_PARAMS_FILENAME = "params.json"
+FEATURES_LOCK_FILENAME = "lock"
+COMPACT_DEAD_FRACTION = 0.5  # Rewrite the data file once more than this fraction of it is superseded features
+
+
+@dataclass(frozen=True)
+class FeatureParams:
+    """
+    Parameters for log-mel filterbank or MFCC features. Any change to these gives a separate cache entry.
+
+    kind (str):         either "logmel" or "mfcc"
+    win_length (int):   analysis window, in frames of audio (25ms at 16kHz)
+    hop_length (int):   step between windows, in frames of audio (10ms at 16kHz)
+    """
+    kind: str = "logmel"
+    n_fft: int = 512
+    win_length: int = 400
+    hop_length: int = 160
+    n_mels: int = 80
+    n_mfcc: int = 13
+    fmin: float = 0.0
+    fmax: float = WAV_FRAME_RATE / 2
+    preemphasis: float = 0.97
+    log_floor: float = 1e-10
+
+    def __post_init__(self):
+        if self.kind not in ("logmel", "mfcc"):
+            raise ValueError(f"Unknown feature kind {self.kind!r}; expected 'logmel' or 'mfcc'")
+
+    @property
+    def dim(self) -> int:
+        return self.n_mfcc if self.kind == "mfcc" else self.n_mels
+
+    def key(self) -> str:
+        encoded = json.dumps(dataclasses.asdict(self), sort_keys=True).encode()
+        return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def compute_features(samples: np.ndarray, params: FeatureParams) -> np.ndarray:
+    """Log-mel or MFCC features for 16-bit PCM samples, as float32 with shape (windows, `params.dim`)."""
+    signal = np.asarray(samples, dtype=np.float32) / np.float32(32768)
+    if params.preemphasis:
+        signal = np.append(signal[:1], signal[1:] - params.preemphasis * signal[:-1])
+    if len(signal) < params.win_length:
+        signal = np.pad(signal, (0, params.win_length - len(signal)))
+
+    windows = np.lib.stride_tricks.sliding_window_view(signal, params.win_length)[::params.hop_length]
+    spectrum = np.abs(np.fft.rfft(windows * _window(params.win_length), n=params.n_fft)) ** 2
+    mel = spectrum @ _mel_filterbank(params.n_fft, params.n_mels, params.fmin, params.fmax).T
+    features = np.log(np.maximum(mel, params.log_floor))
+    if params.kind == "mfcc":
+        features = features @ _dct_matrix(params.n_mels, params.n_mfcc).T
+    return features.astype(np.float32)
+
+
+@lru_cache()
+def _window(win_length: int) -> np.ndarray:
+    return np.hanning(win_length).astype(np.float32)
+
+
+@lru_cache()
+def _mel_filterbank(n_fft: int, n_mels: int, fmin: float, fmax: float) -> np.ndarray:
+    def hz_to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700)
+
+    def mel_to_hz(mel):
+        return 700 * (10 ** (mel / 2595) - 1)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1 / WAV_FRAME_RATE)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0, np.minimum(rising, falling)).astype(np.float32)
+
+
+@lru_cache()
+def _dct_matrix(n_mels: int, n_mfcc: int) -> np.ndarray:
+    # Orthonormal DCT-II
+    n = np.arange(n_mels)
+    basis = np.cos(np.pi / n_mels * (n[None, :] + 0.5) * np.arange(n_mfcc)[:, None])
+    basis[0] *= 1 / np.sqrt(2)
+    return (basis * np.sqrt(2 / n_mels)).astype(np.float32)
+
+
+class PSSTFeatureStore:
+    """
+    Cached features for one split and one set of `FeatureParams`, stored as a single append-only float32 file plus
+    an index of `utterance_id` -> (offset, windows) and the source audio's (mtime, size). Reads are memory-mapped.
+
+    Appends hold a lock file, so several processes can extract into the same store. Once re-extracted utterances
+    leave more than `COMPACT_DEAD_FRACTION` of the data file unused, it's compacted into a new file.
+    """
+
+    def __init__(self, directory: str, params: FeatureParams):
+        self.directory = directory
+        self.params = params
+        self.index: Dict[str, Tuple[int, int, int, int]] = {}
+        self.data_file = FEATURES_DATA_FILENAME
+        self.generation = 0
+        self._data = None
+        self._load_index()
+
+    @classmethod
+    def for_split(cls, version: PSSTVersion, split: str, params: FeatureParams) -> "PSSTFeatureStore":
+        directory = os.path.join(f"{version.local_dir()}-features", split, params.key())
+        return cls(directory, params)
+
+    def __contains__(self, utterance_id):
+        return utterance_id in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def read(self, utterance_id: str) -> np.ndarray:
+        """The features of an utterance, as a read-only (windows, dim) view over the memory-mapped cache."""
+        if self._data is None:
+            try:
+                self._data = self._map()
+            except FileNotFoundError:
+                self._load_index()  # Compacted by another process since the index was loaded
+                self._data = self._map()
+        offset, windows, _, _ = self.index[utterance_id]
+        return self._data[offset:offset + windows]
+
+    def is_current(self, utterance_id: str, source_key: Tuple[int, int]) -> bool:
+        entry = self.index.get(utterance_id)
+        return entry is not None and entry[2:] == source_key
+
+    def append(self, entries: Sequence[Tuple[str, Tuple[int, int], np.ndarray]]):
+        """Append features for (utterance_id, source key, features) entries, replacing older entries in the index."""
+        os.makedirs(self.directory, exist_ok=True)
+        with _locked(os.path.join(self.directory, FEATURES_LOCK_FILENAME)):
+            self._load_index()  # Keep what other processes appended since
+            with open(os.path.join(self.directory, FEATURES_PARAMS_FILENAME), "w") as f:
+                json.dump(dataclasses.asdict(self.params), f, indent=1)
+            with open(os.path.join(self.directory, self.data_file), "ab") as f:
+                # Drop anything past the last indexed row, e.g. a partial row from an append that was interrupted
+                offset = max((start + windows for start, windows, _, _ in self.index.values()), default=0)
+                f.truncate(offset * 4 * self.params.dim)
+                for utterance_id, source_key, features in entries:
+                    f.write(np.ascontiguousarray(features, dtype=np.float32).tobytes())
+                    self.index[utterance_id] = (offset, len(features), *source_key)
+                    offset += len(features)
+            live = sum(windows for _, windows, _, _ in self.index.values())
+            if offset and (offset - live) / offset > COMPACT_DEAD_FRACTION:
+                self._compact()
+            else:
+                self._save_index()
+        self._data = None
+
+    def _map(self) -> np.ndarray:
+        path = os.path.join(self.directory, self.data_file)
+        return np.memmap(path, dtype=np.float32, mode="r").reshape(-1, self.params.dim)
+
+    def _compact(self):
+        # Copy live features to a new data file, so readers still mapping the old one are unaffected
+        old_file = os.path.join(self.directory, self.data_file)
+        old = self._map()
+        self.generation += 1
+        self.data_file = f"features.{self.generation}.f32"
+        with open(os.path.join(self.directory, self.data_file), "wb") as f:
+            offset = 0
+            for utterance_id, (start, windows, mtime, size) in self.index.items():
+                f.write(old[start:start + windows].tobytes())
+                self.index[utterance_id] = (offset, windows, mtime, size)
+                offset += windows
+        del old
+        self._save_index()
+        os.remove(old_file)
+
+    def _load_index(self):
+        try:
+            with np.load(os.path.join(self.directory, FEATURES_INDEX_FILENAME)) as index:
+                rows = zip(index["offsets"].tolist(), index["windows"].tolist(),
+                           index["mtimes"].tolist(), index["sizes"].tolist())
+                self.index = dict(zip(index["utterance_ids"].tolist(), rows))
+                self.generation = int(index["generation"]) if "generation" in index.files else 0
+        except FileNotFoundError:
+            self.index = {}
+            self.generation = 0
+        self.data_file = f"features.{self.generation}.f32" if self.generation else FEATURES_DATA_FILENAME
+        self._data = None
+
+    def _save_index(self):
+        ids = list(self.index)
+        columns = np.array([self.index[i] for i in ids], dtype=np.int64).reshape(-1, 4)
+        incomplete = os.path.join(self.directory, f"incomplete-{os.getpid()}-{FEATURES_INDEX_FILENAME}")
+        np.savez(
+            incomplete,
+            utterance_ids=np.array(ids, dtype=str),
+            offsets=columns[:, 0], windows=columns[:, 1], mtimes=columns[:, 2], sizes=columns[:, 3],
+            generation=self.generation,
+        )
+        os.replace(incomplete, os.path.join(self.directory, FEATURES_INDEX_FILENAME))
+
+
+@contextmanager
+def _locked(path: str):
+    """Hold an exclusive lock on `path` across processes, where `fcntl` is available (not on Windows)."""
+    with open(path, "a") as f:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def extract_features(
+        data: PSSTData,
+        split: str,
+        params: FeatureParams = FeatureParams(),
+        *,
+        n_jobs: int = None,
+        chunk_size: int = 64,
+) -> PSSTFeatureStore:
+    """
+    Compute features for every utterance of `split` that isn't already cached with the same `params` and unchanged
+    source audio, across a pool of `n_jobs` processes (default: one per CPU), and return the feature store.
+    """
+    collection: PSSTUtteranceCollection = getattr(data, split)
+    store = PSSTFeatureStore.for_split(data.version, split, params)
+
+    todo = []
+    for utterance in collection:
+        # Audio kept in a split's tar (see `psstdata.archives`) is keyed on the tar itself
+        archive = collection._archive(utterance.root_dir)
+        if archive is not None and utterance.filename in archive:
+            source_key = _source_key(archive.path)
+        else:
+            source_key = _source_key(utterance.filename_absolute)
+        if not store.is_current(utterance.utterance_id, source_key):
+            todo.append((utterance.utterance_id, utterance.root_dir, utterance.filename, utterance.duration_frames,
+                         source_key))
+    if not todo:
+        return store
+
+    psstdata.logger.info(f"Extracting {params.kind} features for {len(todo)} of {len(collection)} `{split}` utterances")
+    chunks = [(todo[i:i + chunk_size], params) for i in range(0, len(todo), chunk_size)]
+    if n_jobs == 1:
+        for entries in map(_extract_chunk, chunks):
+            store.append(entries)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for entries in executor.map(_extract_chunk, chunks):
+                store.append(entries)
+    return store
+
+
+def _extract_chunk(chunk) -> List[Tuple[str, Tuple[int, int], np.ndarray]]:
+    items, params = chunk
+    archives = {}
+    results = []
+    for utterance_id, root_dir, filename, frames, source_key in items:
+        if root_dir not in archives:
+            archives[root_dir] = PSSTAudioArchive.open(root_dir)
+        archive = archives[root_dir]
+        if archive is not None and filename in archive:
+            samples = archive.read(filename, expected_frames=frames)
+        else:
+            samples = read_audio(os.path.join(root_dir, filename), expected_frames=frames)
+        results.append((utterance_id, source_key, compute_features(samples, params)))
+    return results
+
+
+def _source_key(filename: str) -> Tuple[int, int]:
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
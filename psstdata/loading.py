@@ -1,11 +1,18 @@
 import logging
 import os
+from collections import OrderedDict
 
 import psstdata
 from psstdata._system import cast_dict
 from psstdata.config import PSSTSettings
 from psstdata.datastructures import PSSTData, PSSTUtteranceCollection
 from psstdata.downloading import download
+from psstdata.metrics import PSSTMetrics
+from psstdata.snapshots import load_collection, snapshot_key
+
+LOADED_MEMO_SIZE = 4  # `PSSTData` objects kept for repeated `load()` calls; older ones are rebuilt from snapshots
+
+_loaded = OrderedDict()
 
 
 def load(
@@ -13,9 +20,18 @@ def load(
         *,
         local_dir: str = None,
         log_level=logging.INFO,
-        artificial: bool = False
+        artificial: bool = False,
+        cache: bool = True,
+        offline: bool = None,
+        metrics: PSSTMetrics = None,
+        extract_audio: bool = None
 ) -> PSSTData:
+    """
+    Load a data version, downloading it first if needed. Pass a `PSSTMetrics` as `metrics` to collect the time, bytes
+    and rows of each phase (see `psstdata.metrics`).
+    """
     psstdata.logger.setLevel(log_level)
+    metrics = metrics or PSSTMetrics()
 
     if artificial:
         local_dir = os.path.join(os.path.dirname(psstdata.__file__), "artificialdata")
@@ -28,7 +44,9 @@ def load(
 
     valid_as_test = False
 
-    version = download(local_dir, version_id=version_id)
+    with metrics.phase("download"):
+        version = download(local_dir, version_id=version_id, offline=offline, metrics=metrics,
+                           extract_audio=extract_audio)
     if not os.path.exists(local_dir):
         raise FileNotFoundError(local_dir)
 
@@ -45,11 +63,38 @@ def load(
         tsv_files["test"] = tsv_files["valid"]
         valid_as_test = True
 
+    if not cache:
+        data = {}
+        for split, tsv_file in tsv_files.items():
+            with metrics.phase(f"parse:{split}") as stats:
+                data[split] = PSSTUtteranceCollection.from_tsv(tsv_file)
+                stats.rows += len(data[split])
+        with metrics.phase("validate"):
+            loaded = cast_dict({**data, "version": version, "test_is_placeholder": valid_as_test}, PSSTData)
+        psstdata.logger.info(f"Loaded data version {version.version_id} at {local_dir}")
+        return loaded
+
+    key = tuple(
+        (split, os.path.abspath(tsv_file), tsv_file, snapshot_key(tsv_file, version.version_id))
+        for split, tsv_file in tsv_files.items()
+    )
+    if key in _loaded:
+        psstdata.logger.info(f"Loaded data version {version.version_id} at {local_dir} (cached)")
+        _loaded.move_to_end(key)
+        return _loaded[key]
+
     data = {}
     for split, tsv_file in tsv_files.items():
-        data[split] = PSSTUtteranceCollection.from_tsv(tsv_file)
+        with metrics.phase(f"parse:{split}") as stats:
+            data[split] = load_collection(tsv_file, version.version_id)
+            stats.rows += len(data[split])
 
     psstdata.logger.info(f"Loaded data version {version.version_id} at {local_dir}")
 
-    return cast_dict({**data, "version": version, "test_is_placeholder": valid_as_test}, PSSTData)
+    with metrics.phase("validate"):
+        loaded = cast_dict({**data, "version": version, "test_is_placeholder": valid_as_test}, PSSTData)
+    _loaded[key] = loaded
+    while len(_loaded) > LOADED_MEMO_SIZE:
+        _loaded.popitem(last=False)
+    return loaded
 
@@ -0,0 +1,97 @@
+"""
+Timers and counters for the phases of `psstdata.load()` and `download()`, so a slow start can be pinned on the
+network, decompression, extraction, TSV parsing or validation.
+
+Phases are named `<kind>` or `<kind>:<split>`:
+
+    versions            fetching (or revalidating) the remote `versions.json`
+    network:<split>     streaming the archive (bytes received)
+    verify:<split>      checking the archive's size and checksum (bytes hashed)
+    extract:<split>     unpacking the archive (members, bytes written), including...
+    decompress:<split>  ...the time spent in gzip (bytes decompressed)
+    download            all of `download()`, as seen from `load()`
+    parse:<split>       reading utterances from a snapshot or TSV (rows)
+    validate            building `PSSTData` and checking the splits against each other
+"""
+import dataclasses
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+
+@dataclass
+class PSSTPhaseStats:
+    name: str
+    seconds: float = 0.0
+    bytes: int = 0
+    members: int = 0
+    rows: int = 0
+    calls: int = 0
+
+    @property
+    def kind(self) -> str:
+        return self.name.split(":", 1)[0]
+
+    def __str__(self):
+        counters = ", ".join(
+            f"{count} {name}" for name, count in (("bytes", self.bytes), ("members", self.members), ("rows", self.rows))
+            if count
+        )
+        return f"{self.name}: {self.seconds:.3f}s" + (f" ({counters})" if counters else "")
+
+
+class PSSTMetrics:
+    """
+    Collects `PSSTPhaseStats` by phase name. Pass one to `load(metrics=...)` or `download(metrics=...)` and read
+    `phases` (or `report()`) afterwards, and/or give it a `callback` to be called with each phase's stats as it ends.
+    Safe to share between the threads of a parallel download.
+    """
+
+    def __init__(self, callback: Callable[[PSSTPhaseStats], None] = None):
+        self.callback = callback
+        self.phases: Dict[str, PSSTPhaseStats] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name) -> PSSTPhaseStats:
+        return self.phases[name]
+
+    def __contains__(self, name):
+        return name in self.phases
+
+    def stats(self, name: str) -> PSSTPhaseStats:
+        """The stats of phase `name`, created empty on first use."""
+        with self._lock:
+            if name not in self.phases:
+                self.phases[name] = PSSTPhaseStats(name)
+            return self.phases[name]
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase, yielding its stats so the caller can add to its counters."""
+        stats = self.stats(name)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            with self._lock:
+                stats.seconds += time.perf_counter() - start
+                stats.calls += 1
+            if self.callback is not None:
+                self.callback(stats)
+
+    def totals(self) -> Dict[str, PSSTPhaseStats]:
+        """Stats summed by phase kind, e.g., `network` for `network:train` plus `network:valid`."""
+        totals = {}
+        with self._lock:
+            for stats in self.phases.values():
+                total = totals.setdefault(stats.kind, PSSTPhaseStats(stats.kind))
+                for field in dataclasses.fields(PSSTPhaseStats):
+                    if field.name != "name":
+                        setattr(total, field.name, getattr(total, field.name) + getattr(stats, field.name))
+        return totals
+
+    def report(self) -> str:
+        with self._lock:
+            return "\n".join(str(stats) for stats in self.phases.values())
@@ -1,40 +1,66 @@
 import dataclasses
+import threading
 import time
 from getpass import getpass
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 import psstdata
 from psstdata.config import PSSTSettings, AUTH_COMMENT, CONFIG_FILE_SETTINGS
 
 
+_session = None
+_session_lock = threading.Lock()
+_auth_lock = threading.Lock()
+
+
 def request(method, url, *, data=None, stream=False, **kwargs):
     auth = get_auth()
+    settings = PSSTSettings.load()
+    kwargs.setdefault("timeout", (settings.connect_timeout, settings.read_timeout))
     while True:
         try:
-            response = requests.request(method, url, data=data, stream=stream, auth=auth, **kwargs)
+            response = get_session().request(method, url, data=data, stream=stream, auth=auth, **kwargs)
             response.raise_for_status()
             return response
         except requests.HTTPError as e:
             if e.response.status_code == 401:
                 psstdata.logger.warning(f"Could not authenticate with TalkBank. {AUTH_COMMENT}")
                 time.sleep(0.1)  # HACK: cosmetic, gets around PyCharm's asynchronized output streams
-                auth = get_auth(reset=True)
+                auth = get_auth(reset=True, rejected=auth)
                 continue
             else:
                 raise
 
 
+def get_session() -> requests.Session:
+    """A `requests.Session` shared across threads, with a connection pool sized for `parallel_n_jobs`."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = max(1, PSSTSettings.load().parallel_n_jobs)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
 
-def get_auth(reset=False) -> HTTPBasicAuth:
-    settings = PSSTSettings.load()
-    if not settings.download_username or reset:
-        username = input(f"The credentials in {CONFIG_FILE_SETTINGS} were missing or incorrect.\n"
-                         f"Please enter the PSST username: ")
-        password = getpass(f"Please enter the PSST password: ")
-        settings = dataclasses.replace(settings, download_username=username, download_password=password)
-        settings.save()
-    return HTTPBasicAuth(settings.download_username, settings.download_password)
+
+def get_auth(reset=False, rejected: HTTPBasicAuth = None) -> HTTPBasicAuth:
+    # Only one thread prompts; the others pick up the credentials it saved.
+    with _auth_lock:
+        settings = PSSTSettings.load()
+        current = HTTPBasicAuth(settings.download_username, settings.download_password)
+        if reset and rejected is not None and current != rejected:
+            return current
+        if not settings.download_username or reset:
+            username = input(f"The credentials in {CONFIG_FILE_SETTINGS} were missing or incorrect.\n"
+                             f"Please enter the PSST username: ")
+            password = getpass(f"Please enter the PSST password: ")
+            settings = dataclasses.replace(settings, download_username=username, download_password=password)
+            settings.save()
+        return HTTPBasicAuth(settings.download_username, settings.download_password)
 
 
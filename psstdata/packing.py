@@ -0,0 +1,117 @@
+import dataclasses
+import os
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Tuple, Optional
+
+import numpy as np
+
+import psstdata
+from psstdata.audio import PCM_DTYPE, PSSTAudioError, _convert
+from psstdata.datastructures import PSSTUtteranceCollection
+from psstdata.versioning import PSSTVersion
+
+PACK_FILENAME = "audio.pack"
+PACK_INDEX_FILENAME = "audio.pack.index.npz"
+PACK_FORMAT = 1
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTAudioPack:
+    """
+    A split's PCM audio concatenated into one file, with an index of `utterance_id` -> (frame offset, frame count).
+    The pack is memory-mapped, so reads only touch the requested frames.
+    """
+    root_dir: str
+    pcm: np.ndarray = dataclasses.field(repr=False)
+    index: Dict[str, Tuple[int, int]] = dataclasses.field(repr=False)
+
+    @classmethod
+    def open(cls, root_dir: str) -> Optional["PSSTAudioPack"]:
+        """Open the pack in a split directory, or return None if it is missing or older than `utterances.tsv`."""
+        index_file = os.path.join(root_dir, PACK_INDEX_FILENAME)
+        if not os.path.exists(index_file):
+            return None
+        with np.load(index_file) as index:
+            if int(index["format"]) != PACK_FORMAT or tuple(index["source"]) != _source_key(root_dir):
+                psstdata.logger.warning(f"Ignoring out-of-date audio pack in {root_dir}. Re-run `pack()` to rebuild it.")
+                return None
+            entries = dict(zip(index["utterance_ids"].tolist(), zip(index["offsets"].tolist(), index["frames"].tolist())))
+        pack_file = os.path.join(root_dir, PACK_FILENAME)
+        if os.path.getsize(pack_file) == 0:
+            pcm = np.zeros(0, dtype=PCM_DTYPE)
+        else:
+            pcm = np.memmap(pack_file, dtype=PCM_DTYPE, mode="r")
+        return cls(root_dir, pcm, entries)
+
+    def __contains__(self, utterance_id):
+        return utterance_id in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def read(self, utterance_id: str, start: int = 0, stop: int = None, *, dtype="int16") -> np.ndarray:
+        offset, frames = self.index[utterance_id]
+        return _convert(self.pcm[offset:offset + frames][start:stop], dtype)
+
+
+def pack_version(root_dir: str) -> Optional[int]:
+    """The mtime of a split's pack index, which changes whenever the pack is (re)built, or None if there's no pack."""
+    try:
+        return os.stat(os.path.join(root_dir, PACK_INDEX_FILENAME)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def pack_split(root_dir: str) -> PSSTAudioPack:
+    """
+    (Re)build the audio pack for the split whose `utterances.tsv` is in `root_dir`, from its WAV files (or tar).
+    """
+    collection = PSSTUtteranceCollection.from_tsv(os.path.join(root_dir, "utterances.tsv"))
+    pack_file = os.path.join(root_dir, PACK_FILENAME)
+    index_file = os.path.join(root_dir, PACK_INDEX_FILENAME)
+    incomplete = f"{pack_file}.incomplete"
+
+    offsets = np.zeros(len(collection), dtype=np.int64)
+    frames = np.zeros(len(collection), dtype=np.int64)
+    offset = 0
+    try:
+        with open(incomplete, "wb") as f:
+            for i, utterance in enumerate(collection):
+                samples = collection.audio(i)
+                if samples.ndim != 1:
+                    raise PSSTAudioError(utterance.filename_absolute, "Only mono audio can be packed")
+                f.write(samples.tobytes())
+                offsets[i], frames[i] = offset, len(samples)
+                offset += len(samples)
+    except BaseException:
+        Path(incomplete).unlink(missing_ok=True)
+        raise
+
+    Path(index_file).unlink(missing_ok=True)
+    os.replace(incomplete, pack_file)
+    np.savez(
+        index_file,
+        format=PACK_FORMAT,
+        source=np.array(_source_key(root_dir), dtype=np.int64),
+        utterance_ids=np.array(collection.utterance_ids(), dtype=str),
+        offsets=offsets,
+        frames=frames,
+    )
+    psstdata.logger.info(f"Packed {len(collection)} recordings ({offset * PCM_DTYPE.itemsize * 1024**-2:.0f}MB) in {root_dir}")
+    return PSSTAudioPack.open(root_dir)
+
+
+def pack(version: PSSTVersion) -> Dict[str, PSSTAudioPack]:
+    """Build audio packs for every downloaded split of a version, inside `version.local_dir()`."""
+    return {
+        split: pack_split(os.path.dirname(tsv_file))
+        for split, tsv_file in version.tsv_files().items()
+        if tsv_file is not None
+    }
+
+
+def _source_key(root_dir: str) -> Tuple[int, int]:
+    stat = os.stat(os.path.join(root_dir, "utterances.tsv"))
+    return stat.st_mtime_ns, stat.st_size
+
@@ -0,0 +1,76 @@
+import heapq
+from dataclasses import dataclass
+from typing import Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+BALANCE_OPTIONS = ("duration_frames", "count")
+
+
+@dataclass(frozen=True, eq=False)
+class PSSTShardPlan:
+    """
+    An assignment of a collection's utterances to `world_size` ranks.
+
+    shards (Tuple[np.ndarray, ...]):    the utterance positions of each rank, in collection order
+    loads (np.ndarray):                 each rank's total `duration_frames` (or utterance count)
+    """
+    shards: Tuple[np.ndarray, ...]
+    loads: np.ndarray
+
+    def __len__(self):
+        return len(self.shards)
+
+    @property
+    def imbalance(self) -> float:
+        """How far the most loaded rank is above the mean, e.g. 0.02 for 2% (0.0 is perfectly balanced)."""
+        mean = self.loads.mean() if len(self.loads) else 0
+        return float(self.loads.max() / mean - 1) if mean > 0 else 0.0
+
+
+def plan_shards(
+        collection: "PSSTUtteranceCollection",
+        world_size: int,
+        *,
+        balance: str = "duration_frames",
+        seed: int = 0,
+        epoch: int = 0,
+        keep_sessions: bool = False,
+) -> PSSTShardPlan:
+    """
+    Split a collection across `world_size` ranks so each gets about the same total `duration_frames` (or, with
+    `balance="count"`, the same number of utterances), by greedy bin packing: longest first, each to the least
+    loaded rank. With `keep_sessions`, whole sessions are packed instead of utterances. Ties, and which rank gets
+    which bin, are shuffled by `seed` and `epoch`: every rank computes the same plan, and each rank sees different
+    data from one epoch to the next.
+    """
+    if balance not in BALANCE_OPTIONS:
+        raise ValueError(f"Unknown balance {balance!r}; expected one of {BALANCE_OPTIONS}")
+    if world_size < 1:
+        raise ValueError(f"world_size must be at least 1, not {world_size}")
+
+    columns = collection.columns()
+    n = len(columns)
+    weights = columns.duration_frames if balance == "duration_frames" else np.ones(n, dtype=np.int64)
+    units = columns.session.codes if keep_sessions else np.arange(n)
+    n_units = len(columns.session.categories) if keep_sessions else n
+    unit_weights = np.bincount(units, weights=weights, minlength=n_units)
+
+    rng = np.random.default_rng((seed, epoch))
+    order = rng.permutation(n_units)
+    order = order[np.argsort(-unit_weights[order], kind="stable")]
+
+    assignment = np.empty(n_units, dtype=np.int64)
+    heap = [(0.0, rank) for rank in range(world_size)]
+    for unit in order.tolist():
+        load, rank = heapq.heappop(heap)
+        assignment[unit] = rank
+        heapq.heappush(heap, (load + unit_weights[unit], rank))
+
+    ranks = rng.permutation(world_size)[assignment][units]
+    shards = tuple(np.flatnonzero(ranks == rank) for rank in range(world_size))
+    loads = np.bincount(ranks, weights=weights, minlength=world_size).astype(np.int64)
+    return PSSTShardPlan(shards, loads)
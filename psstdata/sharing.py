@@ -0,0 +1,291 @@
+"""
+Collections published into `multiprocessing.shared_memory`, so data-loader workers can read a split without each
+holding (and, after a fork, touching the refcounts of) their own `PSSTUtterance` objects.
+
+    shared = PSSTSharedCollection.publish(data.train)      # in the parent; keep it open while workers run
+    view = PSSTSharedCollection.attach(shared.name)         # in a worker (or pass `shared` itself: it pickles by name)
+
+The segment holds fixed-width columns (codes, offsets and numbers) plus one UTF-8 string pool, behind a small JSON
+header describing the layout. Utterances are decoded from it on access and not kept.
+"""
+import bisect
+import json
+import struct
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from psstdata.columnar import CATEGORICAL_COLUMNS, STRING_COLUMNS
+from psstdata.datastructures import PSSTUtterance, PSSTUtteranceCollection
+
+SHARED_MAGIC = b"PSSTSHM\x01"
+SHARED_HEADER = struct.Struct("<8sQ")
+SHARED_ALIGNMENT = 8
+
+_attach_lock = threading.Lock()
+
+
+class PSSTSharedCollection:
+    """
+    A read-only, `PSSTUtteranceCollection`-compatible view over a split in shared memory: indexing (by position,
+    slice or `utterance_id`), iteration, `columns()`, `audio()`, `batches()` and `shard()`.
+
+    `utterance_id` lookups binary-search a sorted index in the segment, rather than building a dict per worker.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self.memory = memory
+        self.owner = owner
+        magic, header_length = SHARED_HEADER.unpack_from(memory.buf, 0)
+        if magic != SHARED_MAGIC:
+            raise ValueError(f"Shared memory {memory.name} doesn't hold a published PSST collection")
+        header = json.loads(bytes(memory.buf[SHARED_HEADER.size:SHARED_HEADER.size + header_length]))
+        data_start = _aligned(SHARED_HEADER.size + header_length)
+        self.n = header["n"]
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, (dtype, offset, length) in header["arrays"].items():
+            array = np.frombuffer(memory.buf, dtype=dtype, count=length, offset=data_start + offset)
+            array.flags.writeable = False
+            self._arrays[name] = array
+        self._categories: Dict[str, Tuple[Optional[str], ...]] = {}
+        self._columns = None
+        self._packs = None
+        self._archives = None
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    @classmethod
+    def publish(cls, collection: PSSTUtteranceCollection, name: str = None) -> "PSSTSharedCollection":
+        """Copy a collection into a new shared memory segment, owned by the caller, who should `unlink()` it."""
+        from psstdata.columnar import PSSTCategorical
+
+        columns = collection.columns()
+        pool = bytearray()
+
+        def pooled(strings: Sequence[str]) -> np.ndarray:
+            offsets = np.empty(len(strings) + 1, dtype=np.int64)
+            offsets[0] = len(pool)
+            for i, s in enumerate(strings):
+                pool.extend(s.encode())
+                offsets[i + 1] = len(pool)
+            return offsets
+
+        arrays = {}
+        for field in CATEGORICAL_COLUMNS:
+            if field == "root_dir":
+                categorical = PSSTCategorical.from_values(["" if r is None else r for r in columns.root_dir.tolist()])
+            else:
+                categorical = getattr(columns, field)
+            arrays[field] = np.asarray(categorical.codes, dtype=np.int32)
+            arrays[f"{field}.categories"] = pooled(categorical.categories)
+        for field in STRING_COLUMNS:
+            arrays[field] = pooled(getattr(columns, field).tolist())
+        arrays["correctness"] = columns.correctness
+        arrays["aq_index"] = columns.aq_index
+        arrays["duration_frames"] = columns.duration_frames
+        arrays["id_order"] = np.argsort(columns.utterance_id.astype(str), kind="stable").astype(np.int64)
+        arrays["pool"] = np.frombuffer(bytes(pool), dtype=np.uint8)
+
+        # Array offsets are relative to the data section, which starts at the first aligned byte after the header
+        layout, size = {}, 0
+        for field, array in arrays.items():
+            layout[field] = (array.dtype.str, size, len(array))
+            size += _aligned(array.nbytes)
+        header = json.dumps({"n": len(collection), "arrays": layout}).encode()
+        data_start = _aligned(SHARED_HEADER.size + len(header))
+
+        memory = shared_memory.SharedMemory(name=name, create=True, size=max(1, data_start + size))
+        SHARED_HEADER.pack_into(memory.buf, 0, SHARED_MAGIC, len(header))
+        memory.buf[SHARED_HEADER.size:SHARED_HEADER.size + len(header)] = header
+        for field, array in arrays.items():
+            start = data_start + layout[field][1]
+            memory.buf[start:start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "PSSTSharedCollection":
+        """Attach to a collection published (by this or another process) under `name`."""
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            # Before 3.13, attaching registers the segment with a resource tracker, which would unlink it (from under
+            # the publisher) when an unrelated process exits. Only the publisher should track it, so skip registering
+            # this one segment; anything else registered meanwhile (e.g. by another thread) is passed through.
+            from multiprocessing import resource_tracker
+            with _attach_lock:
+                register = resource_tracker.register
+
+                def register_others(resource_name, resource_type):
+                    if resource_type != "shared_memory" or resource_name.lstrip("/") != name.lstrip("/"):
+                        register(resource_name, resource_type)
+
+                resource_tracker.register = register_others
+                try:
+                    memory = shared_memory.SharedMemory(name=name)
+                finally:
+                    resource_tracker.register = register
+        return cls(memory, owner=False)
+
+    def close(self):
+        """Detach from the segment. Arrays taken from this view (e.g. `columns()`) must be released first."""
+        self._arrays, self._columns, self._packs, self._archives = {}, None, None, None
+        self.memory.close()
+
+    def __del__(self):
+        # Release our views of the buffer before the segment's own finalizer tries to close it
+        self._arrays, self._columns = {}, None
+        try:
+            self.memory.close()
+        except (AttributeError, BufferError):
+            pass
+
+    def unlink(self):
+        """Free the segment once every process has closed it (publisher only)."""
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __reduce__(self):
+        return PSSTSharedCollection.attach, (self.name,)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self) -> Iterator[PSSTUtterance]:
+        for i in range(self.n):
+            yield self._row(i)
+
+    def __getitem__(self, item: Union[int, slice, str]):
+        if isinstance(item, slice):
+            return tuple(self._row(i) for i in range(*item.indices(self.n)))
+        if isinstance(item, str):
+            i = self._find(item)
+            if i is None:
+                raise KeyError(item)
+            return self._row(i)
+        if isinstance(item, (int, np.integer)):
+            if not -self.n <= item < self.n:
+                raise IndexError(item)
+            return self._row(int(item) % self.n)
+        raise NotImplementedError()
+
+    def __contains__(self, item):
+        if isinstance(item, PSSTUtterance):
+            return self.get(item.utterance_id) == item
+        return self._find(item) is not None
+
+    def __repr__(self):
+        return f"PSSTSharedCollection(name={self.name!r}, n={self.n})"
+
+    @property
+    def utterances(self) -> "PSSTSharedCollection":
+        """Positional access, as with `PSSTUtteranceCollection.utterances`."""
+        return self
+
+    def get(self, utterance_id: str, default=None):
+        i = self._find(utterance_id)
+        return default if i is None else self._row(i)
+
+    def utterance_ids(self) -> Tuple[str, ...]:
+        return tuple(self._strings("utterance_id", i) for i in range(self.n))
+
+    def columns(self) -> "PSSTColumns":
+        """A `PSSTColumns` view: numeric and categorical columns are zero-copy; string columns are decoded."""
+        if self._columns is None:
+            from psstdata.columnar import PSSTCategorical, PSSTColumns
+
+            def strings(field):
+                array = np.empty(self.n, dtype=object)
+                array[:] = [self._strings(field, i) for i in range(self.n)]
+                return array
+
+            root_dir = np.asarray(self._category_values("root_dir"), dtype=object)[self._arrays["root_dir"]]
+            self._columns = PSSTColumns(
+                utterance_id=strings("utterance_id"),
+                session=PSSTCategorical(self._arrays["session"], self._category_values("session")),
+                test=PSSTCategorical(self._arrays["test"], self._category_values("test")),
+                prompt=PSSTCategorical(self._arrays["prompt"], self._category_values("prompt")),
+                transcript=strings("transcript"),
+                correctness=self._arrays["correctness"],
+                aq_index=self._arrays["aq_index"],
+                duration_frames=self._arrays["duration_frames"],
+                filename=strings("filename"),
+                root_dir=root_dir,
+            )
+        return self._columns
+
+    def to_collection(self) -> PSSTUtteranceCollection:
+        """Copy the utterances out into an ordinary (process-local) `PSSTUtteranceCollection`."""
+        return PSSTUtteranceCollection(tuple(self))
+
+    audio = PSSTUtteranceCollection.audio
+    batches = PSSTUtteranceCollection.batches
+    shard = PSSTUtteranceCollection.shard
+    _pack = PSSTUtteranceCollection._pack
+    _archive = PSSTUtteranceCollection._archive
+
+    def _row(self, i: int) -> PSSTUtterance:
+        arrays = self._arrays
+        aq_index = float(arrays["aq_index"][i])
+        return PSSTUtterance(
+            utterance_id=self._strings("utterance_id", i),
+            session=self._category("session", i),
+            test=self._category("test", i),
+            prompt=self._category("prompt", i),
+            transcript=self._strings("transcript", i),
+            correctness=bool(arrays["correctness"][i]),
+            aq_index=None if aq_index != aq_index else aq_index,
+            duration_frames=int(arrays["duration_frames"][i]),
+            filename=self._strings("filename", i),
+            root_dir=self._category("root_dir", i),
+        )
+
+    def _strings(self, offsets: str, i: int) -> str:
+        offsets = self._arrays[offsets]
+        return self._arrays["pool"][offsets[i]:offsets[i + 1]].tobytes().decode()
+
+    def _category_values(self, field: str) -> Tuple[Optional[str], ...]:
+        if field not in self._categories:
+            n = len(self._arrays[f"{field}.categories"]) - 1
+            values = tuple(self._strings(f"{field}.categories", i) for i in range(n))
+            self._categories[field] = tuple(v or None for v in values) if field == "root_dir" else values
+        return self._categories[field]
+
+    def _category(self, field: str, i: int) -> Optional[str]:
+        return self._category_values(field)[self._arrays[field][i]]
+
+    def _find(self, utterance_id: str) -> Optional[int]:
+        order = self._arrays["id_order"]
+        keys = _LazyKeys(self, order)
+        k = bisect.bisect_left(keys, utterance_id)
+        if k < len(order) and keys[k] == utterance_id:
+            return int(order[k])
+        return None
+
+
+class _LazyKeys:
+    """The sorted utterance ids, decoded only at the positions a binary search visits."""
+
+    def __init__(self, shared: PSSTSharedCollection, order: np.ndarray):
+        self.shared = shared
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, k):
+        return self.shared._strings("utterance_id", self.order[k])
+
+
+def _aligned(n: int) -> int:
+    return -(-n // SHARED_ALIGNMENT) * SHARED_ALIGNMENT
@@ -0,0 +1,86 @@
+import dataclasses
+import marshal
+import os
+from collections import OrderedDict
+from typing import Tuple
+
+import psstdata
+from psstdata.datastructures import PSSTUtterance, PSSTUtteranceCollection
+
+SNAPSHOT_FILENAME = "utterances.snapshot"
+SNAPSHOT_FORMAT = 2
+MEMO_SIZE = 8  # Splits kept in memory per process; the least recently loaded are re-read from their snapshots
+
+_ROW_FIELDS = tuple(f.name for f in dataclasses.fields(PSSTUtterance) if f.name != "root_dir")
+
+_memo: "OrderedDict[Tuple[str, str], Tuple[Tuple, PSSTUtteranceCollection]]" = OrderedDict()
+
+
+def snapshot_key(tsv_file: str, version_id: str) -> Tuple:
+    stat = os.stat(tsv_file)
+    return SNAPSHOT_FORMAT, version_id, stat.st_mtime_ns, stat.st_size
+
+
+def load_collection(tsv_file: str, version_id: str) -> PSSTUtteranceCollection:
+    """
+    Load a split's `utterances.tsv`, going through an in-process memo (of the `MEMO_SIZE` most recent splits) and
+    then a binary snapshot stored next to the TSV. Both are keyed on the version id and the TSV's mtime/size, so an
+    edited TSV is re-parsed.
+
+    Snapshots are plain `marshal` data (tuples of strings and numbers), never pickles: the data directory may be
+    shared, and reading one mustn't run code that someone else wrote there.
+    """
+    # Utterances keep `root_dir` as given, like `from_tsv`; the absolute path only tells memo entries apart.
+    memo_key = os.path.abspath(tsv_file), tsv_file
+    key = snapshot_key(tsv_file, version_id)
+
+    memoized = _memo.get(memo_key)
+    if memoized is not None and memoized[0] == key:
+        _memo.move_to_end(memo_key)
+        return memoized[1]
+
+    root_dir = os.path.dirname(tsv_file)
+    collection = _read_snapshot(root_dir, key)
+    if collection is None:
+        collection = PSSTUtteranceCollection.from_tsv(tsv_file)
+        _write_snapshot(root_dir, key, collection)
+    _memo[memo_key] = (key, collection)
+    _memo.move_to_end(memo_key)
+    while len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+    return collection
+
+
+def clear_memo():
+    _memo.clear()
+
+
+def _read_snapshot(root_dir: str, key: Tuple):
+    snapshot_file = os.path.join(root_dir, SNAPSHOT_FILENAME)
+    try:
+        with open(snapshot_file, "rb") as f:
+            snapshot_key_, rows = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        psstdata.logger.debug(f"Ignoring unreadable snapshot {snapshot_file}: {e}")
+        return None
+    if snapshot_key_ != tuple(key):
+        return None
+    return PSSTUtteranceCollection(tuple(PSSTUtterance(*row, root_dir) for row in rows))
+
+
+def _write_snapshot(root_dir: str, key: Tuple, collection: PSSTUtteranceCollection):
+    snapshot_file = os.path.join(root_dir, SNAPSHOT_FILENAME)
+    rows = tuple(tuple(getattr(u, field) for field in _ROW_FIELDS) for u in collection)
+    incomplete = f"{snapshot_file}.{os.getpid()}.incomplete"
+    try:
+        with open(incomplete, "wb") as f:
+            marshal.dump((tuple(key), rows), f)
+        os.replace(incomplete, snapshot_file)
+    except OSError as e:
+        psstdata.logger.debug(f"Could not write snapshot {snapshot_file}: {e}")
+        try:
+            os.remove(incomplete)
+        except OSError:
+            pass
@@ -0,0 +1,310 @@
+"""
+Synthetic PSST data packs, and a local stand-in for the TalkBank server, for exercising and benchmarking psstdata
+without credentials. The audio is noise, and transcripts are drawn from `ACCEPTED_PRONUNCIATIONS` (or scrambled,
+for incorrect responses).
+"""
+import base64
+import dataclasses
+import hashlib
+import os
+import random
+import re
+import struct
+import tarfile
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from typing import List, Tuple
+
+import psstdata
+from psstdata import WAV_FRAME_RATE
+from psstdata.datastructures import PSSTUtterance
+from psstdata.tasks import PROMPTS_BNT, PROMPTS_VNT
+from psstdata.versioning import PSSTVersion, PSSTVersionCollection
+
+SPLIT_FRACTIONS = (("train", 0.7), ("valid", 0.1), ("test", 0.2))
+PUBLISHED_PATHS = ("utterances.tsv", "audio")  # What the server has of each split; the rest is derived locally
+
+
+def generate_pack(
+        local_dir: str,
+        n_utterances: int,
+        version_id: str = "SYNTHETIC",
+        *,
+        seed: int = 0,
+        min_seconds: float = 0.5,
+        max_seconds: float = 4.0,
+        split_fractions: Tuple[Tuple[str, float], ...] = SPLIT_FRACTIONS,
+) -> PSSTVersion:
+    """
+    Write an extracted data pack with about `n_utterances` utterances to `local_dir`, laid out like a downloaded
+    version: `psst-data-<version_id>/<split>/utterances.tsv` plus 16kHz WAVs, and a `versions.json`.
+    Sessions (15 BNT + 22 VNT prompts each) are assigned to splits by `split_fractions`.
+    """
+    from psstdata.tasks import ACCEPTED_PRONUNCIATIONS
+
+    rng = random.Random(seed)
+    prompts = [("BNT", i, p) for i, p in enumerate(PROMPTS_BNT)] + [("VNT", i, p) for i, p in enumerate(PROMPTS_VNT)]
+    version = PSSTVersion(
+        version_id=version_id,
+        files={split: f"psst-data-{version_id}_{split}.tar.gz" for split, _ in split_fractions},
+        root_dir=local_dir,
+        comment=f"Synthetic data pack, {n_utterances} utterances, seed {seed}",
+    )
+
+    n_sessions = max(len(split_fractions), -(-n_utterances // len(prompts)))
+    boundaries, total = [], 0.0
+    for split, fraction in split_fractions:
+        total += fraction
+        boundaries.append((split, round(total * n_sessions)))
+
+    rows = {split: [] for split, _ in split_fractions}
+    for s in range(n_sessions):
+        split = next(split for split, boundary in boundaries if s < boundary)
+        session = f"SYN{s:05d}a"
+        aq_index = round(rng.uniform(10.0, 99.9), 1)
+        for test, item, prompt in prompts:
+            if sum(len(r) for r in rows.values()) >= n_utterances:
+                break
+            correctness = rng.random() < 0.6
+            accepted = ACCEPTED_PRONUNCIATIONS[prompt][0].split()
+            transcript = accepted if correctness else rng.sample(accepted, len(accepted))
+            utterance_id = f"{session}-{test}{item + 1:02d}-{prompt}"
+            rows[split].append(PSSTUtterance(
+                utterance_id=utterance_id,
+                session=session,
+                test=test,
+                prompt=prompt,
+                transcript=" ".join(transcript),
+                correctness=correctness,
+                aq_index=aq_index,
+                duration_frames=int(rng.uniform(min_seconds, max_seconds) * WAV_FRAME_RATE),
+                filename=f"audio/{test.lower()}/{session}/{utterance_id}.wav",
+            ))
+
+    columns = [f.name for f in dataclasses.fields(PSSTUtterance) if f.name != "root_dir"]
+    for split, utterances in rows.items():
+        split_dir = os.path.join(version.local_dir(), split)
+        os.makedirs(split_dir, exist_ok=True)
+        with open(os.path.join(split_dir, "utterances.tsv"), "w") as f:
+            f.write("\t".join(columns) + "\n")
+            for u in utterances:
+                values = [getattr(u, c) for c in columns]
+                f.write("\t".join(str(v).upper() if isinstance(v, bool) else str(v) for v in values) + "\n")
+        for u in utterances:
+            filename = os.path.join(split_dir, u.filename)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            write_wav(filename, rng.randbytes(2 * u.duration_frames) if hasattr(rng, "randbytes")
+                      else os.urandom(2 * u.duration_frames))
+
+    PSSTVersionCollection(versions=(version,)).save(local_dir)
+    return version
+
+
+def write_wav(filename: str, pcm: bytes, sample_rate: int = WAV_FRAME_RATE):
+    """Write mono 16-bit PCM bytes as a WAV file."""
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", len(pcm),
+    )
+    with open(filename, "wb") as f:
+        f.write(header)
+        f.write(pcm)
+
+
+def build_server_dir(version: PSSTVersion, server_dir: str, manifests: bool = True) -> PSSTVersionCollection:
+    """
+    Package an extracted version as the server would publish it: one `.tar.gz` per split and a `versions.json`
+    that includes each archive's size and sha256 checksum. Versions already published in `server_dir` are kept.
+
+    With `manifests`, each split's files are also published individually, under `psst-data-<version_id>/<split>/`,
+    with a manifest of their sizes and hashes for incremental upgrades.
+    """
+    import json
+    import shutil
+    from psstdata.verification import MANIFEST_HASH
+
+    os.makedirs(server_dir, exist_ok=True)
+    sizes, checksums, manifest_files = {}, {}, {}
+    for split, archive_name in version.files.items():
+        split_dir = os.path.join(version.local_dir(), split)
+        published_files = _published_files(split_dir)
+        archive = os.path.join(server_dir, archive_name)
+        with tarfile.open(archive, "w:gz") as t:
+            for filename, path in published_files:
+                t.add(path, arcname=f"{split}/{filename}")
+        sizes[split] = os.path.getsize(archive)
+        with open(archive, "rb") as f:
+            checksums[split] = f"sha256:{hashlib.sha256(f.read()).hexdigest()}"
+
+        if manifests:
+            base_path = f"psst-data-{version.version_id}/{split}"
+            files = {}
+            for filename, path in published_files:
+                target = os.path.join(server_dir, base_path, filename)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(path, target)
+                with open(path, "rb") as f:
+                    files[filename] = {
+                        "size": os.path.getsize(path),
+                        MANIFEST_HASH: hashlib.new(MANIFEST_HASH, f.read()).hexdigest(),
+                    }
+            manifest_files[split] = f"psst-data-{version.version_id}_{split}.manifest.json"
+            with open(os.path.join(server_dir, manifest_files[split]), "w") as f:
+                json.dump({"hash": MANIFEST_HASH, "base_path": base_path, "files": files}, f)
+
+    published = dataclasses.replace(version, root_dir=server_dir, sizes=sizes, checksums=checksums,
+                                    manifests=manifest_files or None)
+    try:
+        with open(os.path.join(server_dir, "versions.json")) as f:
+            existing = PSSTVersionCollection.from_object(json.load(f), root_dir=server_dir).versions
+    except FileNotFoundError:
+        existing = ()
+    versions = PSSTVersionCollection(
+        versions=(published, *(v for v in existing if v.version_id != version.version_id))
+    )
+    versions.save(server_dir)
+    return versions
+
+
+def derive_version(
+        version: PSSTVersion,
+        version_id: str,
+        *,
+        changed_fraction: float = 0.05,
+        seed: int = 0,
+) -> PSSTVersion:
+    """
+    Copy an extracted version as `version_id` beside it, with the audio of about `changed_fraction` of utterances
+    re-generated, like a release that fixes a few recordings.
+    """
+    import shutil
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+    rng = random.Random(seed)
+    derived = dataclasses.replace(
+        version,
+        version_id=version_id,
+        files={split: f"psst-data-{version_id}_{split}.tar.gz" for split in version.files},
+        comment=f"Derived from {version.version_id}, {changed_fraction:.0%} of audio changed, seed {seed}",
+        sizes=None,
+        checksums=None,
+        manifests=None,
+    )
+    for split in version.files:
+        for filename, path in _published_files(os.path.join(version.local_dir(), split)):
+            target = os.path.join(derived.local_dir(), split, filename)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(path, target)
+    for split, tsv_file in derived.tsv_files().items():
+        for u in PSSTUtteranceCollection.from_tsv(tsv_file):
+            if rng.random() < changed_fraction:
+                write_wav(os.path.join(os.path.dirname(tsv_file), u.filename), os.urandom(2 * u.duration_frames))
+
+    local_versions = PSSTVersionCollection.from_disk(version.root_dir, suppress_warnings=True)
+    PSSTVersionCollection(
+        versions=(derived, *(v for v in local_versions.versions if v.version_id != version_id))
+    ).save(version.root_dir)
+    return derived
+
+
+def _published_files(split_dir: str) -> List[Tuple[str, str]]:
+    """(filename relative to the split, path) of the files in `PUBLISHED_PATHS`, leaving out snapshots, packs, etc."""
+    results = []
+    for published in PUBLISHED_PATHS:
+        path = os.path.join(split_dir, published)
+        if os.path.isfile(path):
+            results.append((published, path))
+        for directory, _, filenames in os.walk(path):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                results.append((os.path.relpath(path, split_dir).replace(os.sep, "/"), path))
+    return sorted(results)
+
+
+class PSSTStandInServer:
+    """
+    A local HTTP server standing in for TalkBank: serves `directory` with Basic auth, Range requests and ETags.
+    Use as a context manager; `url` is the `base_url` to put in `PSSTSettings`.
+    """
+
+    def __init__(self, directory: str, username: str = "psst", password: str = "psst", port: int = 0):
+        expected_auth = "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _handler(directory, expected_auth))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.username = username
+        self.password = password
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def _handler(directory: str, expected_auth: str):
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def do_GET(self):
+            if self.headers.get("Authorization") != expected_auth:
+                self.send_response(401)
+                self.send_header("WWW-Authenticate", 'Basic realm="psst"')
+                self.end_headers()
+                return
+            path = self.translate_path(self.path)
+            if not os.path.isfile(path):
+                self.send_error(404)
+                return
+            stat = os.stat(path)
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            start, status = 0, 200
+            match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if match and self.headers.get("If-Range", etag) != etag:
+                match = None  # The client's partial copy is of another version of the file: send all of it
+            if match:
+                start, status = int(match.group(1)), 206
+                if start >= stat.st_size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{stat.st_size}")
+                    self.end_headers()
+                    return
+
+            self.send_response(status)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(stat.st_size - start))
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{stat.st_size - 1}/{stat.st_size}")
+            self.end_headers()
+            with open(path, "rb") as f:
+                f.seek(start)
+                while True:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    try:
+                        self.wfile.write(chunk)
+                    except ConnectionError:
+                        return  # The client hung up, e.g. a cancelled download
+
+        def log_message(self, format, *args):
+            psstdata.logger.debug(f"stand-in server: {format % args}")
+
+    return Handler
+
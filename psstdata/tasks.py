@@ -7,9 +7,25 @@ SIL = "<sil>"
 SPN = "<spn>"
 
 VOCAB_ARPABET_JSON = psstdata.assets.path("vocab_arpabet.json")
-VOCAB_ARPABET = read_json(VOCAB_ARPABET_JSON, dict)
+ACCEPTED_PRONUNCIATIONS_JSON = psstdata.assets.path("correctness.json")
 
-ACCEPTED_PRONUNCIATIONS = read_json(psstdata.assets.path("correctness.json"), dict)
+_LAZY_ASSETS = {
+    "VOCAB_ARPABET": VOCAB_ARPABET_JSON,
+    "ACCEPTED_PRONUNCIATIONS": ACCEPTED_PRONUNCIATIONS_JSON,
+}
+
+__all__ = [
+    "PAD", "UNK", "SIL", "SPN", "VOCAB_ARPABET_JSON", "ACCEPTED_PRONUNCIATIONS_JSON", "PROMPTS_BNT", "PROMPTS_VNT",
+    *_LAZY_ASSETS,
+]
+
+
+def __getattr__(name):
+    # VOCAB_ARPABET and ACCEPTED_PRONUNCIATIONS are read from their JSON files on first access.
+    if name not in _LAZY_ASSETS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = read_json(_LAZY_ASSETS[name], dict)
+    return value
 
 PROMPTS_BNT = (
     'house',
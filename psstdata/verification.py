@@ -0,0 +1,200 @@
+"""
+Integrity checks for downloaded data packs: every utterance's audio exists, has a readable WAV header and the number
+of frames given by `duration_frames`, and (optionally) hasn't changed since its hash was recorded in the split's
+manifest.
+
+    python -m psstdata verify [--version VERSION_ID] [--local-dir DIR] [--no-hashes] [--jobs N]
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import psstdata
+from psstdata.archives import PSSTAudioArchive
+from psstdata.audio import PSSTAudioError, parse_wav_info
+from psstdata.versioning import PSSTVersion, PSSTVersionCollection
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_HASH = "sha256"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PSSTVerificationIssue:
+    split: str
+    utterance_id: str
+    filename: str
+    problem: str
+
+    def __str__(self):
+        return f"{self.split}/{self.filename}: {self.problem}"
+
+
+@dataclass(frozen=True)
+class PSSTVerificationReport:
+    """
+    The result of `verify()`.
+
+    n_hashed (int):     how many files were (re-)hashed, i.e. were new or changed size/mtime since the last run
+    """
+    version_id: str
+    n_utterances: int
+    n_hashed: int
+    issues: Tuple[PSSTVerificationIssue, ...]
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def by_split(self) -> Dict[str, Tuple[PSSTVerificationIssue, ...]]:
+        results = {}
+        for issue in self.issues:
+            results.setdefault(issue.split, []).append(issue)
+        return {split: tuple(issues) for split, issues in results.items()}
+
+    def __str__(self):
+        summary = (f"Verified {self.n_utterances} utterances of data version {self.version_id} "
+                   f"({self.n_hashed} hashed): {len(self.issues) or 'no'} problems found")
+        return "\n".join([summary, *(f"  {issue}" for issue in self.issues)])
+
+
+def verify(
+        version_id: str = None,
+        *,
+        local_dir: str = None,
+        hashes: bool = True,
+        n_jobs: int = None,
+        chunk_size: int = 256,
+) -> PSSTVerificationReport:
+    """
+    Check every utterance of a downloaded data version across a pool of `n_jobs` processes (default: one per CPU).
+
+    With `hashes`, each file is also compared to the sha256 in its split's `manifest.json`. Files missing from the
+    manifest are hashed and added to it, and files whose size and mtime match the manifest aren't re-hashed.
+    """
+    from psstdata.config import PSSTSettings
+    from psstdata.datastructures import PSSTUtteranceCollection
+
+    if local_dir is None:
+        local_dir = PSSTSettings.load().local_dir
+    local_dir = os.path.expanduser(local_dir)
+    local_versions = PSSTVersionCollection.from_disk(local_dir, suppress_warnings=True)
+    version: PSSTVersion = local_versions.latest() if version_id is None else local_versions[version_id]
+
+    issues: List[PSSTVerificationIssue] = []
+    n_utterances = n_hashed = 0
+    for split, tsv_file in version.tsv_files().items():
+        if tsv_file is None:
+            continue
+        root_dir = os.path.dirname(tsv_file)
+        for leftover in (f"incomplete-{split}", f"{split}.tar.gz.partial"):
+            if os.path.exists(os.path.join(version.local_dir(), leftover)):
+                issues.append(PSSTVerificationIssue(split, "", leftover, "left over from an interrupted download"))
+
+        collection = PSSTUtteranceCollection.from_tsv(tsv_file)
+        manifest = read_manifest(root_dir) if hashes else {}
+        items = [
+            (u.utterance_id, root_dir, u.filename, u.duration_frames, manifest.get(u.filename), hashes)
+            for u in collection
+        ]
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        psstdata.logger.info(f"Verifying {len(items)} `{split}` utterances in {root_dir}")
+
+        if n_jobs == 1:
+            results = [result for chunk in chunks for result in _verify_chunk(chunk)]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                results = [result for chunk_results in executor.map(_verify_chunk, chunks) for result in chunk_results]
+
+        changed = False
+        for (utterance_id, _, filename, *_), (problem, entry, hashed) in zip(items, results):
+            if problem is not None:
+                issues.append(PSSTVerificationIssue(split, utterance_id, filename, problem))
+            if hashed:
+                n_hashed += 1
+            if entry is not None and manifest.get(filename) != entry:
+                manifest[filename] = entry
+                changed = True
+        if hashes and changed:
+            try:
+                write_manifest(root_dir, manifest)
+            except OSError as e:
+                # E.g. read-only data: the report still stands, the next run just hashes these files again
+                psstdata.logger.warning(f"Couldn't update the manifest in {root_dir}. {type(e).__name__}: {e}")
+        n_utterances += len(items)
+
+    return PSSTVerificationReport(version.version_id, n_utterances, n_hashed, tuple(issues))
+
+
+def _verify_chunk(items) -> List[Tuple[Optional[str], Optional[dict], bool]]:
+    """For each item, (problem or None, manifest entry or None, whether the file was hashed)."""
+    archives = {}
+    results = []
+    for utterance_id, root_dir, filename, duration_frames, recorded, hashes in items:
+        if root_dir not in archives:
+            archives[root_dir] = PSSTAudioArchive.open(root_dir)
+        archive = archives[root_dir]
+        try:
+            if archive is not None:
+                if filename not in archive:
+                    results.append(("missing from audio.tar", None, False))
+                    continue
+                path = archive.path
+                start, size = archive.index[filename]
+                mtime_ns = os.stat(path).st_mtime_ns
+            else:
+                path = os.path.join(root_dir, filename)
+                stat = os.stat(path)
+                start, size, mtime_ns = 0, stat.st_size, stat.st_mtime_ns
+        except FileNotFoundError:
+            results.append(("missing", None, False))
+            continue
+
+        with open(path, "rb") as f:
+            try:
+                info = parse_wav_info(f, filename, start, size)
+                if info.n_frames != duration_frames:
+                    problem = f"expected {duration_frames} frames, found {info.n_frames}"
+                else:
+                    problem = None
+            except (PSSTAudioError, ValueError) as e:  # struct.error is a ValueError, on a truncated header
+                problem = f"unreadable WAV header: {e}"
+
+            if not hashes or (recorded is not None and recorded["size"] == size and recorded["mtime_ns"] == mtime_ns):
+                results.append((problem, None, False))
+                continue
+
+            digest = hashlib.new(MANIFEST_HASH)
+            f.seek(start)
+            remaining = size
+            while remaining > 0:
+                chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        entry = {"size": size, "mtime_ns": mtime_ns, MANIFEST_HASH: digest.hexdigest()}
+        if recorded is not None and recorded[MANIFEST_HASH] != entry[MANIFEST_HASH]:
+            problem = problem or f"{MANIFEST_HASH} differs from {MANIFEST_FILENAME}"
+            entry = None  # Keep the recorded hash, so the file is reported until it's restored
+        results.append((problem, entry, True))
+    return results
+
+
+def read_manifest(root_dir: str) -> Dict[str, dict]:
+    try:
+        with open(os.path.join(root_dir, MANIFEST_FILENAME)) as f:
+            return json.load(f)["files"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return {}
+
+
+def write_manifest(root_dir: str, files: Dict[str, dict]):
+    manifest_file = os.path.join(root_dir, MANIFEST_FILENAME)
+    incomplete = f"{manifest_file}.incomplete"
+    with open(incomplete, "w") as f:
+        json.dump({"hash": MANIFEST_HASH, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(incomplete, manifest_file)
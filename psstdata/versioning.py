@@ -15,6 +15,9 @@ class PSSTVersion:
     files: Dict[str, str]
     root_dir: str
     comment: str = ""
+    sizes: Dict[str, int] = None  # Optional archive sizes in bytes, by split
+    checksums: Dict[str, str] = None  # Optional archive checksums by split, e.g. "sha256:<hex digest>"
+    manifests: Dict[str, str] = None  # Optional per-file manifests by split, for incremental upgrades
 
     def __post_init__(self):
         assert self.root_dir is not None
@@ -14,8 +14,12 @@ setuptools.setup(
     url='https://github.com/PSST-Challenge/psstdata',
     description='Tool for downloading and loading the data for the PSST Challenge',
     install_requires=[
+        "numpy",
         "requests"
     ],
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
     include_package_data=True,  # See MANIFEST.in for package files
 )
 
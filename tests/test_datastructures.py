@@ -0,0 +1,70 @@
+"""
+Index lookups on `PSSTUtteranceCollection`.
+
+    pip install pytest && python -m pytest tests
+"""
+import pytest
+
+from psstdata.datastructures import AQSeverity, PSSTUtterance, PSSTUtteranceCollection
+
+
+def _utterance(utterance_id, session, test, prompt, aq_index, correctness=True):
+    return PSSTUtterance(
+        utterance_id=utterance_id,
+        session=session,
+        test=test,
+        prompt=prompt,
+        transcript="HH AW S",
+        correctness=correctness,
+        aq_index=aq_index,
+        duration_frames=16000,
+        filename=f"audio/{session}/{utterance_id}.wav",
+    )
+
+
+@pytest.fixture
+def collection():
+    return PSSTUtteranceCollection((
+        _utterance("A-BNT01-house", "A", "BNT", "house", 30.0),
+        _utterance("A-VNT01-bark", "A", "VNT", "bark", 30.0, correctness=False),
+        _utterance("B-BNT01-house", "B", "BNT", "house", 80.0),
+        _utterance("B-VNT01-bark", "B", "VNT", "bark", 80.0),
+        _utterance("C-BNT01-house", "C", "BNT", "house", 100.0),
+        _utterance("C-BNT02-comb", "C", "BNT", "comb", 100.0),
+    ))
+
+
+def _ids(collection):
+    return [u.utterance_id for u in collection]
+
+
+def test_where_single_criterion(collection):
+    assert _ids(collection.where(session="B")) == ["B-BNT01-house", "B-VNT01-bark"]
+    assert _ids(collection.where(prompt="nothing")) == []
+
+
+def test_where_multiple_criteria_keep_order(collection):
+    assert _ids(collection.where(test="BNT", prompt="house")) == ["A-BNT01-house", "B-BNT01-house", "C-BNT01-house"]
+    assert _ids(collection.where(test="VNT", session={"B", "C"})) == ["B-VNT01-bark"]
+
+
+def test_where_accepts_sets_of_values(collection):
+    assert _ids(collection.where(session={"C", "A"}, test="BNT")) == ["A-BNT01-house", "C-BNT01-house", "C-BNT02-comb"]
+    assert _ids(collection.where(prompt=("comb", "bark"), session=["A", "C"])) == ["A-VNT01-bark", "C-BNT02-comb"]
+
+
+def test_where_severity(collection):
+    assert _ids(collection.where(severity=AQSeverity.MILD, test="VNT")) == ["B-VNT01-bark"]
+    assert _ids(collection.where(severity={AQSeverity.SEVERE, AQSeverity.MILD}, prompt="bark")) == [
+        "A-VNT01-bark", "B-VNT01-bark",
+    ]
+
+
+def test_where_rejects_unindexed_fields(collection):
+    with pytest.raises(KeyError, match="transcript"):
+        collection.where(transcript="HH AW S")
+
+
+def test_unclassifiable_aq_is_unknown_severity(collection):
+    assert _ids(collection.where(severity=AQSeverity.UNKNOWN)) == ["C-BNT01-house", "C-BNT02-comb"]
+    assert list(collection.columns().severity[-2:]) == [AQSeverity.UNKNOWN.value] * 2
@@ -0,0 +1,261 @@
+"""
+Download failure paths, against a local `PSSTStandInServer` serving synthetic data packs.
+
+    pip install pytest && python -m pytest tests
+"""
+import dataclasses
+import json
+import os
+import tarfile
+import threading
+
+import pytest
+
+import psstdata.config
+from psstdata.config import PSSTSettings
+from psstdata.downloading import PSSTDownloadCancelled, PSSTDownloadError, _download_split, download
+from psstdata.metrics import PSSTMetrics
+from psstdata.synthetic import PSSTStandInServer, build_server_dir, derive_version, generate_pack
+from psstdata.versioning import PSSTVersionCollection
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    settings_file = str(tmp_path / "settings.json")
+    monkeypatch.setattr(psstdata.config, "CONFIG_FILE_SETTINGS", settings_file)
+    PSSTSettings.load.cache_clear()
+    yield settings_file
+    PSSTSettings.load.cache_clear()
+
+
+@pytest.fixture
+def version(tmp_path):
+    return generate_pack(str(tmp_path / "source"), 60, version_id="S1")
+
+
+@pytest.fixture
+def server_dir(tmp_path, version):
+    server_dir = str(tmp_path / "server")
+    build_server_dir(version, server_dir)
+    return server_dir
+
+
+@pytest.fixture
+def server(server_dir, settings_file):
+    with PSSTStandInServer(server_dir) as server:
+        PSSTSettings(
+            base_url=server.url,
+            download_username=server.username,
+            download_password=server.password,
+            parallel_n_jobs=3,
+        ).save()
+        yield server
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    return str(tmp_path / "local")
+
+
+def _files(directory):
+    results = {}
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            with open(path, "rb") as f:
+                results[os.path.relpath(path, directory)] = f.read()
+    return results
+
+
+def _assert_same_data(version, downloaded):
+    for split in version.files:
+        expected = _files(os.path.join(version.local_dir(), split))
+        actual = _files(os.path.join(downloaded.local_dir(), split))
+        actual.pop("manifest.json", None)
+        assert actual == expected
+
+
+def test_download(server, version, local_dir):
+    downloaded = download(local_dir, "S1")
+    _assert_same_data(version, downloaded)
+    assert not [f for f in os.listdir(downloaded.local_dir()) if f not in version.files]
+
+
+def _spool_half(server, server_dir, version, local_dir):
+    """Leave half of `train`'s archive in the local version, as an interrupted download would."""
+    import psstdata.networking
+
+    with open(os.path.join(server_dir, version.files["train"]), "rb") as f:
+        content = f.read()
+    with psstdata.networking.request("GET", f"{server.url}/{version.files['train']}", stream=True) as response:
+        etag = response.headers["ETag"]
+    partial = os.path.join(local_dir, "psst-data-S1", "train.tar.gz.partial")
+    os.makedirs(os.path.dirname(partial))
+    with open(partial, "wb") as f:
+        f.write(content[:len(content) // 2])
+    with open(f"{partial}.validator", "w") as f:
+        f.write(etag)
+    return content
+
+
+def test_download_resumes_partial_archive(server, server_dir, version, local_dir):
+    content = _spool_half(server, server_dir, version, local_dir)
+
+    metrics = PSSTMetrics()
+    downloaded = download(local_dir, "S1", metrics=metrics)
+    assert metrics.stats("network:train").bytes == len(content) - len(content) // 2
+    _assert_same_data(version, downloaded)
+    assert not os.path.exists(os.path.join(local_dir, "psst-data-S1", "train.tar.gz.partial.validator"))
+
+
+def test_download_restarts_when_archive_changed(tmp_path, server, server_dir, version, local_dir):
+    _spool_half(server, server_dir, version, local_dir)
+    changed = generate_pack(str(tmp_path / "changed"), 60, version_id="S1", seed=1)
+    build_server_dir(changed, server_dir)
+
+    metrics = PSSTMetrics()
+    downloaded = download(local_dir, "S1", metrics=metrics)
+    assert metrics.stats("network:train").bytes == os.path.getsize(os.path.join(server_dir, changed.files["train"]))
+    _assert_same_data(changed, downloaded)
+
+
+def test_corrupt_archive_is_downloaded_again(server, server_dir, version, local_dir):
+    split_dir = os.path.join(local_dir, "psst-data-S1")
+    os.makedirs(split_dir)
+    with open(os.path.join(split_dir, "train.tar.gz"), "wb") as f:
+        f.write(b"not a gzip file")
+
+    with pytest.raises(PSSTDownloadError):
+        download(local_dir, "S1")
+    assert not os.path.exists(os.path.join(split_dir, "train.tar.gz"))
+    _assert_same_data(version, download(local_dir, "S1"))
+
+
+def test_download_rejects_bad_checksum(server, server_dir, local_dir):
+    with open(os.path.join(server_dir, "versions.json")) as f:
+        versions = json.load(f)
+    versions["versions"][0]["checksums"]["valid"] = "sha256:" + "0" * 64
+    with open(os.path.join(server_dir, "versions.json"), "w") as f:
+        json.dump(versions, f)
+
+    with pytest.raises(PSSTDownloadError, match="checksum"):
+        download(local_dir, "S1")
+    split_dir = os.path.join(local_dir, "psst-data-S1")
+    assert not os.path.exists(os.path.join(split_dir, "valid"))
+    assert not os.path.exists(os.path.join(split_dir, "valid.tar.gz.partial"))
+
+
+def test_cancelled_split_leaves_nothing_behind(server, version, local_dir):
+    cancelled = threading.Event()
+    cancelled.set()
+    destination = os.path.join(local_dir, "psst-data-S1")
+    with pytest.raises(PSSTDownloadCancelled):
+        _download_split(destination, "train", f"{server.url}/{version.files['train']}", cancelled=cancelled)
+    assert not os.path.exists(os.path.join(destination, "train"))
+    assert not os.path.exists(os.path.join(destination, "incomplete-train"))
+
+
+def test_offline(server, local_dir):
+    with pytest.raises(PSSTDownloadError):
+        download(local_dir, offline=True)
+    download(local_dir, "S1")
+    dataclasses.replace(PSSTSettings.load(), base_url="http://127.0.0.1:9").save()  # Nothing listens there
+    assert download(local_dir, offline=True).version_id == "S1"
+
+
+def test_cached_versions_are_revalidated_for_new_versions(server, server_dir, version, local_dir):
+    download(local_dir, "S1")
+    build_server_dir(derive_version(version, "S2"), server_dir)
+
+    assert download(local_dir).version_id == "S1"  # The cached list of versions is still fresh
+    assert download(local_dir, "S2").version_id == "S2"
+    with pytest.raises(PSSTDownloadError, match="S3"):
+        download(local_dir, "S3")
+
+
+def test_upgrade_links_unchanged_files(server, server_dir, version, local_dir):
+    download(local_dir, "S1")
+    upgrade = derive_version(version, "S2", changed_fraction=0.2)
+    build_server_dir(upgrade, server_dir)
+
+    metrics = PSSTMetrics()
+    downloaded = download(local_dir, "S2", metrics=metrics)
+    _assert_same_data(upgrade, downloaded)
+    train = metrics.stats("link:train")
+    assert train.members > 0
+    assert metrics.stats("network:train").bytes < train.bytes
+    train_dir = os.path.join(downloaded.local_dir(), "train")
+    previous_dir = os.path.join(local_dir, "psst-data-S1", "train")
+    shared = [
+        filename for filename in _files(train_dir)
+        if os.path.exists(os.path.join(previous_dir, filename))
+        and os.path.samefile(os.path.join(train_dir, filename), os.path.join(previous_dir, filename))
+    ]
+    assert len(shared) == train.members
+
+
+def test_upgrade_falls_back_to_full_download(server, server_dir, version, local_dir):
+    download(local_dir, "S1")
+    upgrade = derive_version(version, "S2", changed_fraction=0.2)
+    build_server_dir(upgrade, server_dir)
+    os.remove(os.path.join(server_dir, PSSTVersionCollection.from_disk(server_dir)["S2"].manifests["valid"]))
+
+    metrics = PSSTMetrics()
+    downloaded = download(local_dir, "S2", metrics=metrics)
+    _assert_same_data(upgrade, downloaded)
+    assert metrics.stats("link:valid").members == 0
+    assert metrics.stats("extract:valid").members > 0
+
+
+def test_server_publishes_only_source_files(tmp_path, version):
+    import psstdata.packing
+    psstdata.packing.pack(version)
+    server_dir = str(tmp_path / "server")
+    build_server_dir(version, server_dir)
+    with tarfile.open(os.path.join(server_dir, version.files["train"])) as t:
+        names = t.getnames()
+    assert "train/utterances.tsv" in names
+    assert all(name == "train/utterances.tsv" or name.startswith("train/audio/") for name in names)
+
+
+def test_upgrade_only_hashes_most_recent_version(server, server_dir, version, local_dir):
+    download(local_dir, "S1")
+    build_server_dir(derive_version(version, "S2"), server_dir, manifests=False)
+    download(local_dir, "S2")
+    build_server_dir(derive_version(version, "S3"), server_dir)
+
+    download(local_dir, "S3")
+    assert os.path.exists(os.path.join(local_dir, "psst-data-S2", "train", "manifest.json"))
+    assert not os.path.exists(os.path.join(local_dir, "psst-data-S1", "train", "manifest.json"))
+
+
+def test_upgrade_survives_unwritable_previous_version(server, server_dir, version, local_dir, monkeypatch):
+    import psstdata.verification
+
+    def write_manifest(root_dir, files):
+        raise PermissionError(f"Read-only: {root_dir}")
+
+    download(local_dir, "S1")
+    upgrade = derive_version(version, "S2")
+    build_server_dir(upgrade, server_dir)
+    monkeypatch.setattr(psstdata.verification, "write_manifest", write_manifest)
+
+    metrics = PSSTMetrics()
+    _assert_same_data(upgrade, download(local_dir, "S2", metrics=metrics))
+    assert metrics.stats("extract:train").members > 0
+
+
+def test_interrupt_cancels_queued_splits(server, local_dir, monkeypatch):
+    import psstdata.downloading
+
+    started = []
+
+    def _download_split(destination, split, url, **kwargs):
+        started.append(split)
+        raise KeyboardInterrupt
+
+    dataclasses.replace(PSSTSettings.load(), parallel_n_jobs=1).save()
+    monkeypatch.setattr(psstdata.downloading, "_download_split", _download_split)
+    with pytest.raises(KeyboardInterrupt):
+        download(local_dir, "S1")
+    assert len(started) == 1
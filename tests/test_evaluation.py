@@ -0,0 +1,51 @@
+"""
+`edit_distances` against a plain, unbatched Levenshtein distance.
+
+    pip install pytest && python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from psstdata.evaluation import edit_distances
+
+
+def _levenshtein(reference, hypothesis, substitution_costs=None):
+    previous = [float(j) for j in range(len(hypothesis) + 1)]
+    for i, r in enumerate(reference):
+        current = [i + 1.0]
+        for j, h in enumerate(hypothesis):
+            substitution = float(r != h) if substitution_costs is None else substitution_costs[r, h]
+            current.append(min(previous[j + 1] + 1, current[j] + 1, previous[j] + substitution))
+        previous = current
+    return previous[-1]
+
+
+def _padded(sequences):
+    lengths = np.array([len(s) for s in sequences])
+    ids = np.zeros((len(sequences), max(lengths.max(), 1)), dtype=np.int64)
+    for row, sequence in zip(ids, sequences):
+        row[:len(sequence)] = sequence
+    return ids, lengths
+
+
+@pytest.fixture
+def pairs():
+    random = np.random.default_rng(0)
+    references = [list(random.integers(1, 6, random.integers(0, 9))) for _ in range(200)]
+    hypotheses = [list(random.integers(1, 6, random.integers(0, 9))) for _ in range(200)]
+    return references + [[], [1, 2], []], hypotheses + [[], [], [3, 4, 5]]
+
+
+def test_matches_reference_levenshtein(pairs):
+    references, hypotheses = pairs
+    distances = edit_distances(*_padded(references), *_padded(hypotheses))
+    np.testing.assert_array_equal(distances, [_levenshtein(r, h) for r, h in zip(references, hypotheses)])
+
+
+def test_matches_reference_with_substitution_costs(pairs):
+    references, hypotheses = pairs
+    costs = np.random.default_rng(1).uniform(0, 2, (6, 6))
+    np.fill_diagonal(costs, 0)
+    distances = edit_distances(*_padded(references), *_padded(hypotheses), substitution_costs=costs)
+    expected = [_levenshtein(r, h, costs) for r, h in zip(references, hypotheses)]
+    np.testing.assert_allclose(distances, expected)
@@ -0,0 +1,60 @@
+"""
+Export/import round-trips of splits, in every format whose dependencies are installed.
+
+    pip install pytest && python -m pytest tests
+"""
+import os
+
+import numpy as np
+import pytest
+
+from psstdata.datastructures import PSSTUtteranceCollection
+from psstdata.exporting import EXPORT_EXTENSIONS, export, export_split, import_split, read_columns
+from psstdata.loading import load
+from psstdata.synthetic import generate_pack
+
+
+@pytest.fixture(params=["numpy", "parquet", "arrow"])
+def format(request):
+    if request.param != "numpy":
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+@pytest.fixture
+def data(tmp_path):
+    local_dir = str(tmp_path / "local")
+    generate_pack(local_dir, 40, version_id="S1")
+    return load("S1", local_dir=local_dir, cache=False, offline=True)
+
+
+def _path(tmp_path, split, format):
+    return str(tmp_path / f"{split}{EXPORT_EXTENSIONS[format]}")
+
+
+def test_round_trip(tmp_path, data, format):
+    path = export_split(data.train, _path(tmp_path, "train", format), format)
+    assert import_split(path) == data.train
+
+    columns = read_columns(path)
+    np.testing.assert_array_equal(columns.severity, data.train.columns().severity)
+    assert columns.session == data.train.columns().session
+
+
+def test_round_trip_empty(tmp_path, format):
+    empty = PSSTUtteranceCollection(())
+    assert import_split(export_split(empty, _path(tmp_path, "empty", format), format)) == empty
+
+
+def test_export_every_split(tmp_path, data, format):
+    paths = export(data, str(tmp_path / "export"), format)
+    assert sorted(paths) == ["test", "train", "valid"]
+    for split, path in paths.items():
+        assert import_split(path) == getattr(data, split)
+
+
+def test_import_with_moved_audio(tmp_path, data, format):
+    path = export_split(data.train, _path(tmp_path, "train", format), format)
+    moved = import_split(path, root_dir=str(tmp_path / "moved"))
+    assert [u.filename for u in moved] == [u.filename for u in data.train]
+    assert moved[0].filename_absolute == os.path.join(str(tmp_path / "moved"), data.train[0].filename)
@@ -0,0 +1,73 @@
+"""
+The append-only `PSSTFeatureStore`: reads, re-extraction, compaction and interrupted appends.
+
+    pip install pytest && python -m pytest tests
+"""
+import os
+
+import numpy as np
+import pytest
+
+from psstdata.features import FEATURES_DATA_FILENAME, FeatureParams, PSSTFeatureStore
+
+PARAMS = FeatureParams(n_mels=4)
+
+
+def _features(seed, windows):
+    return np.random.default_rng(seed).standard_normal((windows, PARAMS.dim)).astype(np.float32)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PSSTFeatureStore(str(tmp_path / "features"), PARAMS)
+
+
+def test_append_and_read(store):
+    expected = {f"u{i}": _features(i, 3 + i) for i in range(5)}
+    store.append([(utterance_id, (1, 2), features) for utterance_id, features in expected.items()])
+
+    reopened = PSSTFeatureStore(store.directory, PARAMS)
+    assert len(reopened) == 5
+    for utterance_id, features in expected.items():
+        np.testing.assert_array_equal(reopened.read(utterance_id), features)
+    assert reopened.is_current("u0", (1, 2))
+    assert not reopened.is_current("u0", (1, 3))
+
+
+def test_reextraction_compacts(store):
+    store.append([(f"u{i}", (1, 1), _features(i, 10)) for i in range(4)])
+    store.append([(f"u{i}", (2, 2), _features(10 + i, 10)) for i in range(2)])
+    assert store.generation == 0  # 20 of 60 rows superseded
+
+    store.append([(f"u{i}", (3, 3), _features(20 + i, 10)) for i in range(3)])
+    assert store.generation == 1  # 50 of 90 rows superseded
+    assert not os.path.exists(os.path.join(store.directory, FEATURES_DATA_FILENAME))
+    assert os.path.getsize(os.path.join(store.directory, store.data_file)) == 40 * 4 * PARAMS.dim
+
+    reopened = PSSTFeatureStore(store.directory, PARAMS)
+    for i, seed in enumerate([20, 21, 22, 3]):
+        np.testing.assert_array_equal(reopened.read(f"u{i}"), _features(seed, 10))
+
+
+def test_appends_from_several_stores(store):
+    other = PSSTFeatureStore(store.directory, PARAMS)
+    store.append([("a", (1, 1), _features(0, 5))])
+    other.append([("b", (1, 1), _features(1, 7))])
+    store.append([("c", (1, 1), _features(2, 3))])
+
+    reopened = PSSTFeatureStore(store.directory, PARAMS)
+    assert sorted(reopened.index) == ["a", "b", "c"]
+    for utterance_id, seed, windows in [("a", 0, 5), ("b", 1, 7), ("c", 2, 3)]:
+        np.testing.assert_array_equal(reopened.read(utterance_id), _features(seed, windows))
+
+
+def test_append_after_interrupted_append(store):
+    store.append([("a", (1, 1), _features(0, 5))])
+    with open(os.path.join(store.directory, store.data_file), "ab") as f:
+        f.write(_features(1, 2).tobytes()[:-6])  # Rows the index never got to, ending mid-row
+
+    store.append([("b", (1, 1), _features(2, 4))])
+    reopened = PSSTFeatureStore(store.directory, PARAMS)
+    np.testing.assert_array_equal(reopened.read("a"), _features(0, 5))
+    np.testing.assert_array_equal(reopened.read("b"), _features(2, 4))
+    assert os.path.getsize(os.path.join(store.directory, store.data_file)) == 9 * 4 * PARAMS.dim
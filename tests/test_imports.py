@@ -0,0 +1,20 @@
+"""
+`import psstdata` stays light, while star-imports still provide the lazily imported names.
+
+    pip install pytest && python -m pytest tests
+"""
+import subprocess
+import sys
+
+
+def _run(code):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_is_lazy():
+    _run("import sys, psstdata; assert 'psstdata.loading' not in sys.modules")
+
+
+def test_star_import_includes_lazy_names():
+    _run("from psstdata import *; load, VOCAB_ARPABET, ACCEPTED_PRONUNCIATIONS, PSSTUtteranceCollection")
+    _run("from psstdata.tasks import *; VOCAB_ARPABET, ACCEPTED_PRONUNCIATIONS, PROMPTS_BNT")
@@ -0,0 +1,29 @@
+"""
+`load()` and its snapshot/memo layers, on synthetic data packs.
+
+    pip install pytest && python -m pytest tests
+"""
+import pytest
+
+import psstdata.loading
+from psstdata.loading import load
+from psstdata.snapshots import clear_memo
+from psstdata.synthetic import generate_pack
+
+
+@pytest.fixture
+def relative_local_dir(tmp_path, monkeypatch):
+    generate_pack(str(tmp_path / "local"), 30, version_id="S1")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(psstdata.loading, "_loaded", type(psstdata.loading._loaded)())
+    clear_memo()
+    yield "local"
+    clear_memo()
+
+
+def test_cached_load_matches_uncached_load(relative_local_dir):
+    uncached = load("S1", local_dir=relative_local_dir, cache=False, offline=True)
+    assert load("S1", local_dir=relative_local_dir, offline=True).train == uncached.train
+    psstdata.loading._loaded.clear()
+    clear_memo()
+    assert load("S1", local_dir=relative_local_dir, offline=True).train == uncached.train  # From the snapshot
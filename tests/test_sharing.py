@@ -0,0 +1,114 @@
+"""
+`PSSTSharedCollection`: publishing a split into shared memory, attaching, pickling and cleanup.
+
+    pip install pytest && python -m pytest tests
+"""
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from psstdata.datastructures import PSSTUtterance, PSSTUtteranceCollection
+from psstdata.sharing import PSSTSharedCollection
+
+
+@pytest.fixture
+def collection():
+    return PSSTUtteranceCollection(tuple(
+        PSSTUtterance(
+            utterance_id=f"{session}-{test}{i:02d}-{prompt}",
+            session=session,
+            test=test,
+            prompt=prompt,
+            transcript="K AA M" if i % 2 else "",
+            correctness=bool(i % 3),
+            aq_index=None if session == "C" else 40.0 + i,
+            duration_frames=1000 * i,
+            filename=f"audio/{test.lower()}/{session}/{session}-{test}{i:02d}-{prompt}.wav",
+            root_dir=None if session == "C" else "/data/naïve",
+        )
+        for i, (session, test, prompt) in enumerate([
+            ("B", "BNT", "comb"), ("A", "VNT", "bark"), ("C", "BNT", "house"), ("A", "BNT", "comb"),
+            ("B", "VNT", "swim"),
+        ])
+    ))
+
+
+@pytest.fixture
+def shared(collection):
+    with PSSTSharedCollection.publish(collection) as shared:
+        yield shared
+
+
+def test_publish(shared, collection):
+    assert len(shared) == len(collection)
+    assert list(shared) == list(collection)
+    assert shared[-1] == collection[-1]
+    assert shared[1:3] == collection.utterances[1:3]
+    assert shared.to_collection() == collection
+
+
+def test_lookup_by_id(shared, collection):
+    for utterance in collection:
+        assert shared[utterance.utterance_id] == utterance
+        assert utterance in shared
+    assert shared.get("Z-BNT01-house") is None
+    with pytest.raises(KeyError):
+        shared["Z-BNT01-house"]
+
+
+def test_columns(shared, collection):
+    columns, expected = shared.columns(), collection.columns()
+    assert columns.session == expected.session
+    assert columns.prompt == expected.prompt
+    np.testing.assert_array_equal(columns.aq_index, expected.aq_index)
+    np.testing.assert_array_equal(columns.severity, expected.severity)
+    assert columns.root_dir.tolist() == expected.root_dir.tolist()
+    assert columns.transcript.tolist() == expected.transcript.tolist()
+
+
+def test_attach_and_close(shared, collection):
+    view = PSSTSharedCollection.attach(shared.name)
+    assert not view.owner
+    assert list(view) == list(collection)
+    view.close()
+    assert list(shared) == list(collection)  # Still readable by the publisher
+
+
+def test_pickles_by_name(shared, collection):
+    data = pickle.dumps(shared)
+    assert len(data) < 200
+    view = pickle.loads(data)
+    assert view.name == shared.name and not view.owner
+    assert list(view) == list(collection)
+    view.close()
+
+
+def _worker_ids(view):
+    try:
+        return [u.utterance_id for u in view]
+    finally:
+        view.close()
+
+
+def test_workers_leave_segment_to_publisher(shared, collection):
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        assert pool.apply(_worker_ids, (shared,)) == [u.utterance_id for u in collection]
+    view = PSSTSharedCollection.attach(shared.name)  # Not unlinked when the worker exited
+    assert len(view) == len(collection)
+    view.close()
+
+
+def test_unlink(collection):
+    with PSSTSharedCollection.publish(collection) as shared:
+        name = shared.name
+    with pytest.raises(FileNotFoundError):
+        PSSTSharedCollection.attach(name)
+
+
+def test_publish_empty():
+    with PSSTSharedCollection.publish(PSSTUtteranceCollection(())) as shared:
+        assert len(shared) == 0
+        assert list(shared) == []
+        assert shared.get("A-BNT01-house") is None
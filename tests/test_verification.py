@@ -0,0 +1,45 @@
+"""
+`verify()` and `python -m psstdata verify`, on synthetic data packs.
+
+    pip install pytest && python -m pytest tests
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import psstdata.verification
+from psstdata.synthetic import generate_pack
+from psstdata.verification import read_manifest, verify
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    local_dir = str(tmp_path / "local")
+    generate_pack(local_dir, 30, version_id="S1")
+    return local_dir
+
+
+def test_verify_writes_manifests(local_dir):
+    report = verify("S1", local_dir=local_dir, n_jobs=1)
+    assert report.ok
+    assert read_manifest(os.path.join(local_dir, "psst-data-S1", "train"))
+
+
+def test_verify_read_only_data(local_dir, monkeypatch):
+    def write_manifest(root_dir, files):
+        raise PermissionError(f"Read-only: {root_dir}")
+
+    monkeypatch.setattr(psstdata.verification, "write_manifest", write_manifest)
+    report = verify("S1", local_dir=local_dir, n_jobs=1)
+    assert report.ok
+    assert report.n_hashed == report.n_utterances
+
+
+def test_cli_unknown_version(local_dir):
+    result = subprocess.run([sys.executable, "-m", "psstdata", "verify", "--version", "S9", "--local-dir", local_dir],
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "S9" in result.stderr
+    assert "Traceback" not in result.stderr